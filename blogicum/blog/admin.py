@@ -1,16 +1,80 @@
+from functools import partial
+
 from django.contrib import admin
+from django.db.models import Q
+from django.db.models.functions import Substr
+
+from blogicum import writequeue
+
+from .categories import category_cache
+from .filters import AuthorFilter, CategoryFilter, LocationFilter, PostFilter
+from .models import Category, Comment, Location, Post, User
+from .paginators import CommentCountPaginator, EstimatedCountPaginator
+from .search import COMMENT_FTS_TABLE, FTS_TABLE, match_filter, match_ids
+
+TEXT_PREVIEW_LENGTH = 80
+
+
+class SerializedChangelistMixin:
+    """Записывает изменения списка через очередь blogicum.writequeue.
+
+    Права, проверка формсета list_editable, действия и рендеринг остаются
+    в потоке запроса. Записи объектов и журнала админки, сделанные при
+    обработке POST, откладываются и передаются потоку-писателю одной
+    функцией.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'POST':
+            return super().changelist_view(request, extra_context)
+        request.changelist_writes = writes = []
+        try:
+            response = super().changelist_view(request, extra_context)
+        finally:
+            del request.changelist_writes
+        if writes:
+            writequeue.run(self.apply_writes, writes)
+        return response
+
+    @staticmethod
+    def apply_writes(writes):
+        for write in writes:
+            write()
+
+    def write(self, request, func, *args):
+        writes = getattr(request, 'changelist_writes', None)
+        if writes is None:
+            return func(*args)
+        writes.append(partial(func, *args))
+
+    def save_model(self, request, obj, form, change):
+        self.write(request, super().save_model, request, obj, form, change)
 
-from .models import Category, Comment, Location, Post
+    def save_related(self, request, form, formsets, change):
+        self.write(
+            request, super().save_related, request, form, formsets, change
+        )
+
+    def log_change(self, request, obj, message):
+        return self.write(request, super().log_change, request, obj, message)
+
+    def log_deletion(self, request, obj, object_repr):
+        return self.write(
+            request, super().log_deletion, request, obj, object_repr
+        )
+
+    def delete_queryset(self, request, queryset):
+        self.write(request, super().delete_queryset, request, queryset)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(SerializedChangelistMixin, admin.ModelAdmin):
     list_display = (
         'title',
-        'text',
+        'text_preview',
         'pub_date',
         'author',
-        'category',
+        'post_category',
         'location',
         'is_published',
         'created_at'
@@ -19,22 +83,58 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'pub_date'
     )
+    # Поиск идёт по индексу FTS5 (см. get_search_results), а не LIKE.
     search_fields = (
         'title',
+        'text',
     )
     list_filter = (
-        'author',
-        'category',
-        'location'
+        AuthorFilter,
+        CategoryFilter,
+        LocationFilter,
+        'is_published',
     )
     list_display_links = (
         'title',
     )
+    list_select_related = (
+        'author',
+        'location',
+    )
+    autocomplete_fields = (
+        'author',
+        'category',
+        'location',
+    )
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = 'Не задано'
 
+    def get_queryset(self, request):
+        # Полный текст в списке не нужен: превью обрезается в SQL.
+        return super().get_queryset(request).defer('text').annotate(
+            text_preview=Substr('text', 1, TEXT_PREVIEW_LENGTH + 1)
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return match_filter(queryset, search_term), False
+
+    @admin.display(description='Текст')
+    def text_preview(self, obj):
+        if len(obj.text_preview) > TEXT_PREVIEW_LENGTH:
+            return obj.text_preview[:TEXT_PREVIEW_LENGTH] + '…'
+        return obj.text_preview
+
+    @admin.display(description='Категория', ordering='category__title')
+    def post_category(self, obj):
+        return category_cache.get_by_id(obj.category_id)
+
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(SerializedChangelistMixin, admin.ModelAdmin):
     list_display = (
         'title',
         'description',
@@ -57,7 +157,7 @@ class CategoryAdmin(admin.ModelAdmin):
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(SerializedChangelistMixin, admin.ModelAdmin):
     list_display = (
         'name',
         'is_published',
@@ -77,7 +177,7 @@ class LocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(SerializedChangelistMixin, admin.ModelAdmin):
     list_display = (
         'author',
         'text',
@@ -87,13 +187,48 @@ class CommentAdmin(admin.ModelAdmin):
     list_editable = (
         'text',
     )
+    # Поиск по имени автора (точно), заголовку публикации и тексту
+    # комментария (FTS5), см. get_search_results.
     search_fields = (
-        'author',
-        'post',
+        'author__username',
+        'post__title',
+        'text',
     )
     list_filter = (
-        'author',
+        AuthorFilter,
+        PostFilter,
     )
     list_display_links = (
         'author',
     )
+    list_select_related = (
+        'author',
+        'post',
+    )
+    autocomplete_fields = (
+        'author',
+        'post',
+    )
+    # Порядок по первичному ключу не требует сортировки таблицы.
+    ordering = (
+        '-id',
+    )
+    paginator = CommentCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Все условия — по столбцам blog_comment, чтобы SQLite объединил
+        # выборки по индексам, а не просматривал таблицу.
+        condition = Q(author__in=User.objects.filter(
+            username=search_term
+        ).values('pk'))
+        comment_ids = match_ids(search_term, COMMENT_FTS_TABLE)
+        if comment_ids is not None:
+            condition |= Q(pk__in=comment_ids)
+            condition |= Q(post_id__in=match_ids(
+                search_term, FTS_TABLE, columns=('title',)
+            ))
+        return queryset.filter(condition), False
@@ -0,0 +1,116 @@
+import hashlib
+import math
+import time
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+VERSION_KEY = 'blog:version:{}:{}'
+PAGE_KEY = 'blog:page:{}:{}'
+SYNDICATION_KEY = 'blog:syndication:{}'
+FEED_CHANGED_KEY = 'blog:feed_changed:{}'
+FEED_CLOCK_KEY = 'blog:feed_clock'
+# Общая отметка: изменения, видимые во всех лентах (категории, места,
+# профили авторов).
+ALL_FEEDS = 'all'
+INDEX_FEED = 'index'
+
+
+def _new_version():
+    # Версия после вытеснения из кэша не должна совпасть с прежней,
+    # иначе снова станут актуальными старые фрагменты.
+    return time.time_ns()
+
+
+def version_key(name, pk):
+    return VERSION_KEY.format(name, pk)
+
+
+def get_versions(*keys):
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_version(name, pk):
+    key = version_key(name, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def get_generation(name):
+    return get_versions(version_key(name, 'all'))[0]
+
+
+def bump_generation(name):
+    bump_version(name, 'all')
+
+
+def page_cache_key(request):
+    url = hashlib.md5(
+        request.build_absolute_uri().encode()
+    ).hexdigest()
+    return PAGE_KEY.format(get_generation('pages'), url)
+
+
+def syndication_cache_key(etag):
+    return SYNDICATION_KEY.format(etag)
+
+
+def category_feed(category_id):
+    return f'category:{category_id}'
+
+
+def author_feed(username):
+    return f'author:{username}'
+
+
+def post_feeds(category_id, username):
+    feeds = [INDEX_FEED, author_feed(username)]
+    if category_id is not None:
+        feeds.append(category_feed(category_id))
+    return feeds
+
+
+def _next_feed_marker():
+    # Last-Modified передаётся с точностью до секунды: каждая новая
+    # отметка — целая секунда, строго больше всех выданных раньше, иначе
+    # два изменения за одну секунду дали бы клиенту с If-Modified-Since
+    # ответ 304 со старой лентой.
+    marker = math.ceil(time.time())
+    last = cache.get(FEED_CLOCK_KEY)
+    if last is not None and marker <= last:
+        marker = last + 1
+    cache.set(FEED_CLOCK_KEY, marker, None)
+    return marker
+
+
+def touch_feeds(*feeds):
+    marker = _next_feed_marker()
+    cache.set_many(
+        {FEED_CHANGED_KEY.format(feed): marker for feed in feeds}, None
+    )
+
+
+def get_feed_changed(feed):
+    """Время последнего изменения ленты с учётом общей отметки.
+
+    Отметка, вытесненная из кэша, считается только что изменённой.
+    """
+    keys = [FEED_CHANGED_KEY.format(name) for name in (feed, ALL_FEEDS)]
+    changed = cache.get_many(keys)
+    missing = [key for key in keys if key not in changed]
+    if missing:
+        marker = _next_feed_marker()
+        for key in missing:
+            cache.add(key, marker, None)
+        changed.update(cache.get_many(missing))
+    marker = max(changed.values()) if changed else _next_feed_marker()
+    return datetime.fromtimestamp(marker, tz=timezone.utc)
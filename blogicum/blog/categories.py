@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import Http404
+
+from blogicum import routers
+
+from .caching import get_generation
+from .models import Category
+
+
+class CategoryCache:
+    """Ограниченный LRU-кэш категорий внутри процесса.
+
+    Категории меняются редко, поэтому страницы читают их отсюда, а не из
+    базы. Согласованность между процессами обеспечивает поколение
+    «categories» в общем кэше: сигналы Category увеличивают его при каждом
+    сохранении и удалении, и при расхождении локальный кэш очищается.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._generation = None
+
+    def queryset(self):
+        # Кэш живёт до смены поколения, а его сдвигает запись в default:
+        # отстающая реплика вернула бы уже изменённую категорию.
+        return Category.objects.using(routers.DEFAULT_DB_ALIAS)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _check_generation(self):
+        generation = get_generation('categories')
+        with self._lock:
+            if generation != self._generation:
+                self._entries.clear()
+                self._generation = generation
+        return generation
+
+    def _get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key]
+        return False, None
+
+    def _store(self, generation, key, category):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = category
+            if category is not None:
+                self._entries[('id', category.pk)] = category
+                self._entries[('slug', category.slug)] = category
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key, **lookup):
+        generation = self._check_generation()
+        found, category = self._get(key)
+        if not found:
+            category = self.queryset().filter(**lookup).first()
+            self._store(generation, key, category)
+        return category
+
+    def get_by_slug(self, slug):
+        return self._lookup(('slug', slug), slug=slug)
+
+    def get_by_id(self, pk):
+        if pk is None:
+            return None
+        return self._lookup(('id', pk), pk=pk)
+
+    def get_many_by_id(self, pks):
+        generation = self._check_generation()
+        result, missing = {}, set()
+        for pk in set(pks) - {None}:
+            found, category = self._get(('id', pk))
+            if found:
+                result[pk] = category
+            else:
+                missing.add(pk)
+        if missing:
+            fetched = self.queryset().in_bulk(missing)
+            for pk in missing:
+                result[pk] = fetched.get(pk)
+                self._store(generation, ('id', pk), result[pk])
+        return result
+
+
+category_cache = CategoryCache(settings.CATEGORY_CACHE_SIZE)
+
+
+def get_published_category_or_404(slug):
+    category = category_cache.get_by_slug(slug)
+    if category is None or not category.is_published:
+        raise Http404('Категория не найдена.')
+    return category
@@ -0,0 +1,154 @@
+"""Ленты RSS и Atom: главная, категории и авторы.
+
+В ленту попадают последние SYNDICATION_ITEMS публикаций из
+get_published_posts(), то есть те же, что видны в HTML-лентах. Готовый
+ответ хранится в кэше под ключом из отметки изменения ленты и адреса, а
+повторный запрос с совпавшим ETag или If-Modified-Since получает 304 без
+запросов к базе.
+"""
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import linebreaks
+from django.urls import reverse
+from django.utils.feedgenerator import Rss201rev2Feed
+from django.views import View
+
+from blogicum import routers
+
+from .caching import (INDEX_FEED, author_feed, category_feed,
+                      syndication_cache_key)
+from .categories import get_published_category_or_404
+from .mixins import FeedConditionalMixin
+from .models import User
+from .modules import get_published_posts
+
+
+class PostFeed(Feed):
+    feed_name = INDEX_FEED
+
+    def get_feed_name(self, **kwargs):
+        return self.feed_name
+
+    def get_queryset(self, obj):
+        return get_published_posts().select_related('category')
+
+    def title(self):
+        return 'Блогикум'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def description(self):
+        return 'Новые публикации Блогикума'
+
+    def subtitle(self, obj):
+        return self._get_dynamic_attr('description', obj)
+
+    def items(self, obj):
+        return self.get_queryset(obj).order_by(
+            '-pub_date', '-id'
+        )[:settings.SYNDICATION_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return linebreaks(post.text, autoescape=True)
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.pk])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_categories(self, post):
+        if post.category is None:
+            return ()
+        return (post.category.title,)
+
+
+class CategoryFeed(PostFeed):
+    def get_feed_name(self, category_slug, **kwargs):
+        return category_feed(
+            get_published_category_or_404(category_slug).pk
+        )
+
+    def get_object(self, request, category_slug):
+        return get_published_category_or_404(category_slug)
+
+    def get_queryset(self, category):
+        return super().get_queryset(category).filter(category=category)
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def description(self, category):
+        return category.description
+
+
+class AuthorFeed(PostFeed):
+    def get_feed_name(self, username, **kwargs):
+        return author_feed(username)
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_queryset(self, author):
+        return super().get_queryset(author).filter(author=author)
+
+    def title(self, author):
+        return f'Блогикум: {author.get_full_name() or author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+
+class SyndicationView(FeedConditionalMixin, View):
+    """Отдаёт ленту feed_class в формате feed_type из кэша."""
+
+    feed_class = PostFeed
+    feed_type = Rss201rev2Feed
+    query_budget = 4
+    read_replica = True
+    cache_timeout = settings.SYNDICATION_CACHE_TIMEOUT
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.feed = self.feed_class()
+        self.feed.feed_type = self.feed_type
+
+    def get_feed_name(self):
+        return self.feed.get_feed_name(**self.kwargs)
+
+    def is_conditional(self, request):
+        # Лента не зависит от посетителя и не выводит сообщений.
+        return True
+
+    def get_etag(self):
+        # Ссылки в ленте абсолютные: адрес учитывается вместе с хостом.
+        return hashlib.md5(':'.join([
+            str(self.feed_changed.timestamp()),
+            self.request.build_absolute_uri(),
+        ]).encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        key = syndication_cache_key(self.get_etag())
+        response = cache.get(key)
+        if response is None:
+            response = self.feed(request, *args, **kwargs)
+            if not routers.read_from_replica():
+                cache.set(key, response, self.cache_timeout)
+        return response
@@ -0,0 +1,66 @@
+from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр списка админки с полем ввода вместо перечня значений.
+
+    Стандартный фильтр по внешнему ключу выводит все связанные объекты
+    (например, всех пользователей); здесь значение вводится вручную и
+    ищется по уникальному индексированному полю lookup.
+    """
+
+    template = 'admin/input_filter.html'
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        # Непустой список нужен, чтобы админка показала фильтр.
+        return ((None, None),)
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if value:
+            return queryset.filter(**{self.lookup: value})
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            'hidden_params': [
+                (key, value)
+                for key, value in changelist.params.items()
+                if key not in (self.parameter_name, PAGE_VAR)
+            ],
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору (имя пользователя)'
+    parameter_name = 'author'
+    lookup = 'author__username'
+
+
+class CategoryFilter(InputFilter):
+    title = 'категории (идентификатор)'
+    parameter_name = 'category'
+    lookup = 'category__slug'
+
+
+class LocationFilter(InputFilter):
+    title = 'местоположению'
+    parameter_name = 'location'
+    lookup = 'location__name'
+
+
+class PostFilter(InputFilter):
+    title = 'публикации (id)'
+    parameter_name = 'post'
+    lookup = 'post_id'
+
+    def queryset(self, request, queryset):
+        if (self.value() or '').strip().isdigit():
+            return super().queryset(request, queryset)
+        return queryset
@@ -0,0 +1,90 @@
+import csv
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import transfer
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает категории, местоположения, публикации и '
+        'комментарии в JSONL (все модели в одном файле) или CSV (одна '
+        'модель). Память не растёт с размером таблиц.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=('jsonl', 'csv'),
+            default='jsonl',
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            choices=tuple(transfer.MODELS),
+            help='Выгружаемая модель; можно указать несколько раз. '
+                 'По умолчанию — все модели (для CSV нужна ровно одна).'
+        )
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='Файл выгрузки; «-» — стандартный вывод.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Сколько строк читать из базы за один раз.'
+        )
+
+    def handle(self, *args, format, models, output, chunk_size, **options):
+        names = [name for name in transfer.MODELS if name in (
+            models or transfer.MODELS
+        )]
+        if format == 'csv' and len(names) != 1:
+            raise CommandError('Для CSV укажите ровно одну модель --model.')
+        if chunk_size < 1:
+            raise CommandError('--chunk-size должен быть положительным.')
+        stream = (
+            sys.stdout if output == '-'
+            else open(output, 'w', encoding='utf-8', newline='')
+        )
+        started = time.monotonic()
+        total = 0
+        try:
+            for name in names:
+                total += self.export_model(name, format, stream, chunk_size)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено записей: {total} за {elapsed:.1f} с '
+            f'({total / elapsed:.0f} записей/с).'
+        ))
+
+    def export_model(self, name, format, stream, chunk_size):
+        fields = transfer.FIELDS[name]
+        rows = transfer.export_queryset(name).iterator(chunk_size=chunk_size)
+        count = 0
+        if format == 'csv':
+            writer = csv.writer(stream)
+            writer.writerow(fields)
+            for row in rows:
+                writer.writerow([
+                    value.isoformat() if hasattr(value, 'isoformat')
+                    else value
+                    for value in row
+                ])
+                count += 1
+        else:
+            for row in rows:
+                stream.write(transfer.dumps(
+                    {'model': name, **dict(zip(fields, row))}
+                ) + '\n')
+                count += 1
+        return count
@@ -0,0 +1,318 @@
+import random
+import time
+from array import array
+from datetime import datetime
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog import transfer
+from blog.models import Category, Comment, Location, Post
+from blogicum import sqlite
+
+User = get_user_model()
+
+WORDS = (
+    'город река дорога утро вечер лес поле дом окно книга письмо друг '
+    'поезд вокзал море берег ветер снег дождь солнце облако мост улица '
+    'площадь рынок кофе чай хлеб сад парк озеро гора тропа лодка камень '
+    'история встреча прогулка путешествие открытие заметка мысль идея '
+    'старый новый тихий шумный яркий тёплый холодный далёкий близкий '
+    'смотреть идти писать читать думать помнить ждать видеть слушать'
+).split()
+
+# Образцов текста немного: генерация слов дороже самих вставок.
+SAMPLE_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими пользователями, категориями, '
+        'местоположениями, публикациями (включая отложенные) и '
+        'комментариями для нагрузочного тестирования. Вставка — пакетным '
+        'bulk_create; при одинаковом --seed данные совпадают.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=5000,
+            help='Общее количество комментариев.'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для распределения комментариев: '
+                 '0 — равномерно, больше — сильнее перекос к популярным '
+                 'публикациям.'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='За сколько дней до текущего момента распределены '
+                 'даты публикаций.'
+        )
+        parser.add_argument(
+            '--future-share',
+            type=float,
+            default=0.02,
+            help='Доля отложенных публикаций с датой в ближайшие 30 дней.'
+        )
+        parser.add_argument(
+            '--unpublished-share',
+            type=float,
+            default=0.03,
+            help='Доля публикаций, снятых с публикации.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Начальное значение генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--prefix',
+            default='load-',
+            help='Префикс имён пользователей и идентификаторов категорий; '
+                 'существующие записи с такими именами переиспользуются.'
+        )
+        parser.add_argument(
+            '--password',
+            help='Пароль всех созданных пользователей; '
+                 'по умолчанию войти под ними нельзя.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Количество записей в одном bulk_create.'
+        )
+
+    def handle(self, *args, users, categories, locations, posts, comments,
+               skew, days, future_share, unpublished_share, seed, prefix,
+               password, batch_size, **options):
+        if min(users, categories) < 1:
+            raise CommandError(
+                'Нужен хотя бы один пользователь и одна категория.'
+            )
+        if min(locations, posts, comments, days) < 0 or batch_size < 1:
+            raise CommandError('Количества должны быть неотрицательными.')
+        if not (0 <= future_share <= 1 and 0 <= unpublished_share <= 1):
+            raise CommandError('Доли задаются числом от 0 до 1.')
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.verbosity = options['verbosity']
+        self.now = timezone.now()
+        started = time.monotonic()
+        self.texts = [self.sentence(20, 80) for _ in range(SAMPLE_SIZE)]
+        self.titles = [self.sentence(2, 6) for _ in range(SAMPLE_SIZE)]
+
+        with sqlite.immediate():
+            author_ids = self.create_users(users, prefix, password)
+            category_ids = self.create_categories(categories, prefix)
+            location_ids = self.create_locations(locations)
+            pub_dates = self.pub_dates(posts, days, future_share)
+            comment_counts = self.distribute_comments(
+                pub_dates, comments, skew
+            )
+            post_ids = self.create_posts(
+                pub_dates, comment_counts, author_ids, category_ids,
+                location_ids, unpublished_share
+            )
+            self.create_comments(
+                pub_dates, comment_counts, post_ids, author_ids
+            )
+
+        transfer.refresh_after_bulk_load()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {users}, категорий {categories}, '
+            f'местоположений {locations}, публикаций {posts}, '
+            f'комментариев {comments} за {elapsed:.1f} с.'
+        ))
+
+    def sentence(self, min_words, max_words):
+        words = self.rng.choices(
+            WORDS, k=self.rng.randint(min_words, max_words)
+        )
+        return ' '.join(words).capitalize()
+
+    def bulk_create(self, model, objects):
+        started = time.monotonic()
+        count = 0
+        batch = []
+        with transfer.keep_dates(model):
+            for obj in objects:
+                batch.append(obj)
+                if len(batch) >= self.batch_size:
+                    model.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_create(batch)
+                count += len(batch)
+        if self.verbosity >= 2:
+            elapsed = max(time.monotonic() - started, 1e-9)
+            self.stderr.write(
+                f'{model._meta.verbose_name_plural}: {count} за '
+                f'{elapsed:.1f} с ({count / elapsed:.0f} записей/с).'
+            )
+
+    def create_users(self, count, prefix, password):
+        # Хэш пароля считается один раз: PBKDF2 на каждого пользователя
+        # занял бы больше времени, чем вся остальная генерация.
+        password = make_password(password)
+        users = [
+            User(username=f'{prefix}{number}', password=password)
+            for number in range(1, count + 1)
+        ]
+        User.objects.bulk_create(
+            users, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        return list(User.objects.filter(
+            username__startswith=prefix
+        ).order_by('pk').values_list('pk', flat=True)[:count])
+
+    def create_categories(self, count, prefix):
+        # Каждая десятая категория не опубликована: её публикации скрыты.
+        categories = [
+            Category(
+                title=self.titles[number % SAMPLE_SIZE],
+                description=self.texts[number % SAMPLE_SIZE],
+                slug=f'{prefix}{number}',
+                is_published=number % 10 != 0,
+            )
+            for number in range(1, count + 1)
+        ]
+        Category.objects.bulk_create(
+            categories, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        return dict(Category.objects.filter(
+            slug__startswith=prefix
+        ).order_by('pk').values_list('pk', 'is_published')[:count])
+
+    def create_locations(self, count):
+        last_pk = self.last_pk(Location)
+        self.bulk_create(Location, (
+            Location(name=self.sentence(1, 3), created_at=self.now)
+            for _ in range(count)
+        ))
+        return self.new_pks(Location, last_pk)
+
+    def pub_dates(self, count, days, future_share):
+        """Даты публикаций (timestamp), включая отложенные."""
+        now = self.now.timestamp()
+        return array('d', (
+            now + self.rng.uniform(60, 30 * 86400)
+            if self.rng.random() < future_share
+            else now - self.rng.uniform(0, days * 86400)
+            for _ in range(count)
+        ))
+
+    def create_posts(self, pub_dates, comment_counts, author_ids, categories,
+                     location_ids, unpublished_share):
+        """Создаёт публикации; возвращает их первичные ключи по порядку.
+
+        Комментарии распределены заранее, поэтому comment_count
+        записывается той же вставкой, без UPDATE каждой публикации.
+        """
+        rng = self.rng
+        now = self.now.timestamp()
+        category_ids = list(categories)
+        location_ids = location_ids or [None]
+        last_pk = self.last_pk(Post)
+
+        def make_posts():
+            for number, timestamp in enumerate(pub_dates):
+                pub_date = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+                category_id = rng.choice(category_ids)
+                is_published = rng.random() >= unpublished_share
+                yield Post(
+                    title=rng.choice(self.titles),
+                    text=rng.choice(self.texts),
+                    pub_date=pub_date,
+                    author_id=rng.choice(author_ids),
+                    category_id=category_id,
+                    location_id=rng.choice(location_ids),
+                    is_published=is_published,
+                    is_visible=bool(
+                        is_published
+                        and categories[category_id]
+                        and timestamp <= now
+                    ),
+                    comment_count=comment_counts[number],
+                    created_at=min(pub_date, self.now),
+                )
+
+        self.bulk_create(Post, make_posts())
+        return self.new_pks(Post, last_pk)
+
+    def distribute_comments(self, pub_dates, comments, skew):
+        """Количество комментариев каждой публикации по закону Ципфа.
+
+        Комментируются только уже вышедшие публикации; какие из них
+        «популярные», определяется случайной перестановкой.
+        """
+        counts = array('L', [0]) * len(pub_dates)
+        now = self.now.timestamp()
+        ranked = [
+            number for number, timestamp in enumerate(pub_dates)
+            if timestamp <= now
+        ]
+        if not ranked or not comments:
+            return counts
+        self.rng.shuffle(ranked)
+        cum_weights = list(accumulate(
+            (rank + 1) ** -skew for rank in range(len(ranked))
+        ))
+        remaining = comments
+        while remaining:
+            chunk = min(remaining, self.batch_size)
+            for rank in self.rng.choices(
+                range(len(ranked)), cum_weights=cum_weights, k=chunk
+            ):
+                counts[ranked[rank]] += 1
+            remaining -= chunk
+        return counts
+
+    def create_comments(self, pub_dates, comment_counts, post_ids,
+                        author_ids):
+        rng = self.rng
+        now = self.now.timestamp()
+
+        def make_comments():
+            for number, post_id in enumerate(post_ids):
+                pub_date = pub_dates[number]
+                for _ in range(comment_counts[number]):
+                    yield Comment(
+                        text=rng.choice(self.texts),
+                        post_id=post_id,
+                        author_id=rng.choice(author_ids),
+                        created_at=datetime.fromtimestamp(
+                            rng.uniform(pub_date, now), tz=timezone.utc
+                        ),
+                    )
+
+        self.bulk_create(Comment, make_comments())
+
+    @staticmethod
+    def last_pk(model):
+        last = model.objects.order_by('-pk').values_list('pk', flat=True)
+        return last.first() or 0
+
+    @staticmethod
+    def new_pks(model, last_pk):
+        # SQLite выдаёт первичные ключи по возрастанию в порядке вставки.
+        return list(model.objects.filter(
+            pk__gt=last_pk
+        ).order_by('pk').values_list('pk', flat=True))
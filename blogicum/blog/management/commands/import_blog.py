@@ -0,0 +1,236 @@
+import csv
+import json
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from blog import transfer
+from blog.models import Category, Comment, Post
+from blogicum import sqlite
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает выгрузку export_blog пакетами bulk_create. Первичные '
+        'ключи сохраняются, уже существующие записи пропускаются, поэтому '
+        'прерванную загрузку можно продолжить с контрольной точки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл выгрузки (.jsonl или .csv).'
+        )
+        parser.add_argument(
+            '--format',
+            choices=('jsonl', 'csv'),
+            help='Формат файла; по умолчанию — по расширению.'
+        )
+        parser.add_argument(
+            '--model',
+            choices=tuple(transfer.MODELS),
+            help='Модель записей CSV-файла.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество записей в одном bulk_create.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки; по умолчанию <path>.checkpoint.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать заново, не продолжая с контрольной точки.'
+        )
+        parser.add_argument(
+            '--create-missing-users',
+            action='store_true',
+            help='Создавать авторов, которых нет в базе, без пароля; '
+                 'иначе их записи пропускаются.'
+        )
+
+    def handle(self, *args, path, format, model, batch_size, checkpoint,
+               restart, create_missing_users, **options):
+        format = format or os.path.splitext(path)[1].lstrip('.').lower()
+        if format not in ('jsonl', 'csv'):
+            raise CommandError('Укажите --format: jsonl или csv.')
+        if format == 'csv' and not model:
+            raise CommandError('Для CSV укажите модель записей --model.')
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        self.batch_size = batch_size
+        self.verbosity = options['verbosity']
+        self.create_missing_users = create_missing_users
+        self.user_ids = {}
+        self.category_published = {}
+        self.checkpoint = checkpoint or f'{path}.checkpoint'
+        self.skip = 0 if restart else self.read_checkpoint(path)
+        if self.skip:
+            self.stderr.write(
+                f'Продолжение с записи {self.skip + 1} '
+                f'(контрольная точка {self.checkpoint}).'
+            )
+        self.imported = self.skipped = 0
+        self.started = time.monotonic()
+
+        with open(path, encoding='utf-8', newline='') as stream:
+            self.load(self.read(stream, format, model), path)
+
+        transfer.refresh_after_bulk_load()
+        if os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено записей: {self.imported}, пропущено: '
+            f'{self.skipped}, за {elapsed:.1f} с '
+            f'({self.imported / elapsed:.0f} записей/с).'
+        ))
+
+    def read(self, stream, format, model):
+        if format == 'csv':
+            for record in csv.DictReader(stream):
+                yield model, record
+            return
+        for line in stream:
+            if line.strip():
+                record = json.loads(line)
+                yield record.pop('model'), record
+
+    def read_checkpoint(self, path):
+        if not os.path.exists(self.checkpoint):
+            return 0
+        with open(self.checkpoint, encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get('path') != os.path.abspath(path):
+            raise CommandError(
+                f'Контрольная точка {self.checkpoint} относится к другому '
+                'файлу; укажите --restart.'
+            )
+        return state['position']
+
+    def write_checkpoint(self, path, position):
+        with open(self.checkpoint, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'path': os.path.abspath(path), 'position': position}, file
+            )
+
+    def load(self, records, path):
+        batch, batch_model = [], None
+        position = 0
+        for position, (name, record) in enumerate(records, start=1):
+            if position <= self.skip:
+                continue
+            if name not in transfer.MODELS:
+                raise CommandError(
+                    f'Запись {position}: неизвестная модель {name!r}.'
+                )
+            if batch and (name != batch_model
+                          or len(batch) >= self.batch_size):
+                self.flush(batch_model, batch, path, position - 1)
+                batch = []
+            batch_model = name
+            batch.append(record)
+        if batch:
+            self.flush(batch_model, batch, path, position)
+
+    def resolve_users(self, records):
+        usernames = {
+            record[transfer.AUTHOR] for record in records
+        } - set(self.user_ids)
+        if not usernames:
+            return
+        self.user_ids.update(User.objects.filter(
+            username__in=usernames
+        ).values_list('username', 'pk'))
+        missing = usernames - set(self.user_ids)
+        if missing and self.create_missing_users:
+            users = [User(username=username) for username in missing]
+            for user in users:
+                user.set_unusable_password()
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            self.user_ids.update(User.objects.filter(
+                username__in=missing
+            ).values_list('username', 'pk'))
+
+    def resolve_categories(self, posts):
+        category_ids = {
+            post.category_id for post in posts
+        } - set(self.category_published) - {None}
+        if category_ids:
+            self.category_published.update(Category.objects.filter(
+                pk__in=category_ids
+            ).values_list('pk', 'is_published'))
+
+    def build(self, name, records):
+        if transfer.AUTHOR in transfer.FIELDS[name]:
+            self.resolve_users(records)
+            known = [
+                record for record in records
+                if record[transfer.AUTHOR] in self.user_ids
+            ]
+            self.skipped += len(records) - len(known)
+            records = known
+        objects = [
+            transfer.build_instance(name, record, self.user_ids)
+            for record in records
+        ]
+        if name == 'comment':
+            # Публикации пропущенных авторов не загружены: комментарии к
+            # ним нарушили бы внешний ключ и оборвали бы загрузку.
+            post_ids = set(Post.objects.filter(
+                pk__in={comment.post_id for comment in objects}
+            ).values_list('pk', flat=True))
+            known = [
+                comment for comment in objects
+                if comment.post_id in post_ids
+            ]
+            self.skipped += len(objects) - len(known)
+            objects = known
+        if name == 'post':
+            self.resolve_categories(objects)
+            now = timezone.now()
+            for post in objects:
+                post.is_visible = bool(
+                    post.is_published
+                    and self.category_published.get(post.category_id)
+                    and post.pub_date <= now
+                )
+        return objects
+
+    def flush(self, name, records, path, position):
+        model = transfer.MODELS[name]
+        with sqlite.immediate():
+            objects = self.build(name, records)
+            with transfer.keep_dates(model):
+                model.objects.bulk_create(objects, ignore_conflicts=True)
+            if name == 'comment':
+                self.recount_comments({obj.post_id for obj in objects})
+        self.write_checkpoint(path, position)
+        self.imported += len(objects)
+        if self.verbosity >= 2:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            self.stderr.write(
+                f'{position}: {self.imported} записей, '
+                f'{self.imported / elapsed:.0f} записей/с.'
+            )
+
+    def recount_comments(self, post_ids):
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        Post.objects.filter(pk__in=post_ids).update(
+            comment_count=Coalesce(Subquery(counts), 0)
+        )
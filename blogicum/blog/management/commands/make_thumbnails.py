@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.tasks import generate_thumbnails
+from jobs.models import Job
+from jobs.queue import enqueue
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт уменьшенные копии изображений публикаций, '
+        'загруженных до появления вариантов или с ошибкой обработки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать варианты, даже если они уже есть '
+                 '(например, после изменения POST_IMAGE_VARIANTS).'
+        )
+        parser.add_argument(
+            '--defer',
+            action='store_true',
+            help='Не обрабатывать изображения сразу, а поставить задачи '
+                 'в очередь run_jobs с низким приоритетом.'
+        )
+
+    def handle(self, *args, force, defer, **options):
+        post_ids = Post.objects.exclude(
+            image=''
+        ).order_by(
+            'pk'
+        ).values_list(
+            'pk',
+            flat=True
+        )
+        checked = created = 0
+        for post_id in post_ids.iterator():
+            checked += 1
+            if defer:
+                enqueue(
+                    'blog.generate_thumbnails',
+                    {'post_id': post_id, 'force': force},
+                    priority=Job.PRIORITY_LOW
+                )
+            else:
+                created += len(generate_thumbnails(post_id, force=force))
+        if defer:
+            message = f'Поставлено в очередь задач: {checked}.'
+        else:
+            message = (
+                f'Публикаций с изображением: {checked}, '
+                f'создано вариантов: {created}.'
+            )
+        self.stdout.write(self.style.SUCCESS(message))
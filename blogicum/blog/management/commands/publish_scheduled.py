@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Включает отложенные публикации, время которых наступило, '
+        'и пересчитывает флаг видимости Post.is_visible.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать видимость всех публикаций, а не только '
+                 'отложенных.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, проверяя публикации с интервалом '
+                 '--interval.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.SCHEDULER_RECHECK_INTERVAL,
+            help='Интервал проверки в секундах для режима --loop.'
+        )
+
+    def handle(self, *args, full, loop, interval, **options):
+        post_ids = scheduler.sync_all() if full else (
+            scheduler.publish_due_posts()
+        )
+        self.stdout.write(f'Изменена видимость публикаций: {len(post_ids)}.')
+        while loop:
+            time.sleep(interval)
+            post_ids = scheduler.publish_due_posts()
+            if post_ids:
+                self.stdout.write(
+                    f'Включено отложенных публикаций: {len(post_ids)}.'
+                )
@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog import transfer
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает денормализованный счётчик комментариев '
+        'Post.comment_count пакетами по первичному ключу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одном пакете.'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить счётчики, не исправляя их; '
+                 'при расхождениях команда завершается с ошибкой.'
+        )
+
+    def handle(self, *args, batch_size, check, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть положительным.')
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        checked = mismatched = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Post.objects.filter(
+                    pk__gt=last_pk
+                ).order_by(
+                    'pk'
+                ).values_list(
+                    'pk',
+                    'comment_count'
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            actual = dict(
+                Comment.objects.filter(
+                    post_id__in=[pk for pk, _ in batch]
+                ).order_by().values_list(
+                    'post_id'
+                ).annotate(
+                    total=Count('pk')
+                )
+            )
+            stale = [
+                pk for pk, stored in batch if stored != actual.get(pk, 0)
+            ]
+            checked += len(batch)
+            mismatched += len(stale)
+            if stale and not check:
+                # Пересчёт одним UPDATE, чтобы не затереть комментарии,
+                # добавленные между чтением пакета и записью.
+                Post.objects.filter(pk__in=stale).update(
+                    comment_count=Coalesce(Subquery(counts), 0)
+                )
+        if mismatched and not check:
+            # UPDATE минует сигналы: кэши страниц и лент сбрасываются здесь.
+            transfer.refresh_after_bulk_load()
+        if check and mismatched:
+            raise CommandError(
+                f'Неверный счётчик комментариев у {mismatched} '
+                f'из {checked} публикаций.'
+            )
+        action = 'проверено' if check else 'пересчитано'
+        self.stdout.write(self.style.SUCCESS(
+            f'Публикаций {action}: {checked}, исправлено расхождений: '
+            f'{0 if check else mismatched}.'
+        ))
@@ -0,0 +1,63 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует базу default в файлы реплик SQLite через backup API. '
+        'Копия согласована: каждая реплика получает снимок default на '
+        'момент окончания копирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alias',
+            action='append',
+            dest='aliases',
+            help='Реплика из DATABASES; можно указать несколько раз. '
+                 'По умолчанию — все DATABASE_REPLICAS.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Повторять копирование с этим интервалом в секундах; '
+                 '0 — скопировать один раз.'
+        )
+
+    def handle(self, *args, aliases, interval, **options):
+        aliases = aliases or settings.DATABASE_REPLICAS
+        if not aliases:
+            raise CommandError(
+                'Нет реплик: укажите --alias или DATABASE_REPLICAS.'
+            )
+        for alias in aliases:
+            if alias not in settings.DATABASES or alias == DEFAULT_DB_ALIAS:
+                raise CommandError(f'{alias!r} — не реплика из DATABASES.')
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'Реплика {alias!r} — не база SQLite.')
+        while True:
+            for alias in aliases:
+                self.sync(alias)
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def sync(self, alias):
+        started = time.monotonic()
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        target = sqlite3.connect(
+            str(connections[alias].settings_dict['NAME']), uri=True
+        )
+        try:
+            source.connection.backup(target)
+        finally:
+            target.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'{alias}: скопировано за {time.monotonic() - started:.2f} с.'
+        ))
@@ -0,0 +1,73 @@
+import logging
+
+from django.conf import settings
+
+from blogicum import routers
+
+from .query_budget import count_queries, get_query_budget
+
+logger = logging.getLogger('blog.query_budget')
+
+
+class QueryBudgetMiddleware:
+    """Пишет в лог запросы, превысившие бюджет SQL-запросов своего view.
+
+    Бюджет задаётся атрибутом query_budget класса представления и
+    включает все запросы за время обработки, в том числе к сессии и
+    пользователю.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with count_queries() as queries:
+            response = self.get_response(request)
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and queries.count > budget:
+            logger.warning(
+                'Превышен бюджет SQL-запросов для %s: %d из %d',
+                request.path,
+                queries.count,
+                budget,
+                extra={'request': request}
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_query_budget(view_func)
+
+
+class ReplicaRoutingMiddleware:
+    """Отправляет чтения GET-запросов к read_replica-представлениям на реплику.
+
+    После запроса, записавшего данные, ставит cookie, с которой следующие
+    REPLICA_STICKY_SECONDS секунд пользователь читает с default.
+    """
+
+    cookie_name = 'use_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routers.request_scope() as scope:
+            response = self.get_response(request)
+        if scope.wrote:
+            response.set_cookie(
+                self.cookie_name,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view_class, 'read_replica', False)
+            and self.cookie_name not in request.COOKIES
+        ):
+            routers.use_replica()
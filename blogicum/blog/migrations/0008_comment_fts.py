@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# Индекс текста комментариев для поиска модераторов; устроен так же, как
+# blog_post_fts из 0006_post_fts.
+CREATE_FTS = [
+    """
+    CREATE VIRTUAL TABLE blog_comment_fts USING fts5(
+        text,
+        content='blog_comment',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_insert AFTER INSERT ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_delete AFTER DELETE ON blog_comment
+    BEGIN
+        INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER blog_comment_fts_update AFTER UPDATE OF text
+    ON blog_comment BEGIN
+        INSERT INTO blog_comment_fts(blog_comment_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO blog_comment_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    "INSERT INTO blog_comment_fts(blog_comment_fts) VALUES ('rebuild')",
+]
+
+DROP_FTS = [
+    'DROP TRIGGER IF EXISTS blog_comment_fts_update',
+    'DROP TRIGGER IF EXISTS blog_comment_fts_delete',
+    'DROP TRIGGER IF EXISTS blog_comment_fts_insert',
+    'DROP TABLE IF EXISTS blog_comment_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_pub_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FTS, DROP_FTS),
+    ]
@@ -1,6 +1,24 @@
+import hashlib
+import math
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import models
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                quote_etag)
+from django.utils.http import http_date
+
+from blogicum import routers, writequeue
+
+from .caching import (INDEX_FEED, get_feed_changed, get_versions,
+                      page_cache_key, version_key)
+from .categories import category_cache
 from .forms import CommentForm, PostForm
 from .models import Comment
 from .modules import get_posts
+from .paginators import CursorPaginator, FeedPaginator, InvalidCursor
 
 
 class CommentMixin:
@@ -9,6 +27,31 @@ class CommentMixin:
     template_name = 'blog/comment.html'
 
 
+class CommentPaginationMixin:
+    """Комментарии публикации порциями по курсору, от старых к новым."""
+
+    comments_cursor_kwarg = 'comments_cursor'
+    comments_ordering = ('created_at', 'id')
+
+    def get_comments_page(self):
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            settings.COUNT_COMMENTS,
+            ordering=self.comments_ordering
+        )
+        try:
+            return paginator.page(
+                self.request.GET.get(self.comments_cursor_kwarg)
+            )
+        except InvalidCursor as error:
+            raise Http404(str(error))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = self.get_comments_page()
+        return context
+
+
 class PostMixin:
     template_name = 'blog/create.html'
     form_class = PostForm
@@ -17,3 +60,235 @@ class PostMixin:
 class PostUpdateDeleteMixin:
     pk_url_kwarg = 'post_id'
     queryset = get_posts()
+
+
+class FeedPaginationMixin:
+    paginate_by = settings.COUNT_POSTS
+    paginator_class = FeedPaginator
+    cursor_kwarg = 'cursor'
+    cursor_ordering = ('-pub_date', '-id')
+    paginator_template_name = 'includes/paginator.html'
+
+    def uses_cursor_pagination(self):
+        return settings.FEED_PAGINATION == 'cursor'
+
+    def get_count_cache_key(self):
+        return self.request.path
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return self.paginator_class(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_key=self.get_count_cache_key(),
+            count_limit=settings.FEED_COUNT_LIMIT,
+            **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.uses_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering=self.cursor_ordering
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Категории карточек одним запросом, а не по запросу на карточку.
+        category_cache.get_many_by_id(
+            post.category_id for post in context['object_list']
+        )
+        if self.uses_cursor_pagination():
+            context['paginator_template'] = CursorPaginator.template_name
+            return context
+        context['paginator_template'] = self.paginator_template_name
+        page = context.get('page_obj')
+        if page is not None:
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number
+            )
+        return context
+
+
+class AnonymousPageCacheMixin:
+    page_cache_timeout = settings.PAGE_CACHE_TIMEOUT
+
+    def is_page_cacheable(self, request):
+        return (
+            request.method in ('GET', 'HEAD')
+            and not request.user.is_authenticated
+            and CookieStorage.cookie_name not in request.COOKIES
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        def store(response):
+            # Страница с CSRF-токеном или cookie привязана к посетителю.
+            if not (request.META.get('CSRF_COOKIE_USED')
+                    or response.cookies
+                    or routers.read_from_replica()):
+                cache.set(key, response, self.page_cache_timeout)
+
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+
+class ConditionalResponseMixin:
+    """Общая часть условных ответов: ETag, Last-Modified и 304."""
+
+    def get_etag(self):
+        return None
+
+    def get_last_modified(self):
+        return None
+
+    def is_conditional(self, request):
+        # Flash-сообщения выводятся при рендеринге, 304 их бы потерял.
+        return CookieStorage.cookie_name not in request.COOKIES
+
+    def get_validators(self):
+        etag = self.get_etag()
+        last_modified = self.get_last_modified()
+        return (
+            quote_etag(etag) if etag else None,
+            # Округление вверх: отброшенные доли секунды превратили бы
+            # изменение в ту же секунду в 304 по If-Modified-Since.
+            math.ceil(last_modified.timestamp()) if last_modified else None
+        )
+
+    def set_validators(self, response, etag, last_modified):
+        if response.status_code not in (200, 304):
+            return response
+        if etag:
+            response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def conditional_response(self, request, render):
+        """Возвращает 304, если валидаторы совпали, иначе вызывает render."""
+        etag, last_modified = self.get_validators()
+        response = None
+        if self.is_conditional(request):
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+        if response is None:
+            response = render()
+        return self.set_validators(response, etag, last_modified)
+
+
+class ConditionalGetMixin(ConditionalResponseMixin):
+    """Отвечает 304 на повторный GET, не рендеря шаблон.
+
+    Объект загружается до проверки валидаторов: права доступа и 404
+    проверяются как обычно, а пропускается только рендеринг.
+    """
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        return self.conditional_response(
+            request,
+            lambda: self.render_to_response(
+                self.get_context_data(object=self.object)
+            )
+        )
+
+
+class FeedConditionalMixin(ConditionalResponseMixin):
+    """Условные ответы лент по отметке последнего изменения ленты.
+
+    Отметка хранится в кэше и обновляется сигналами при записи публикаций,
+    комментариев, категорий, мест и пользователей, поэтому проверка
+    валидаторов не выполняет запросов к ленте. Миксин должен стоять
+    перед AnonymousPageCacheMixin.
+    """
+
+    feed_name = INDEX_FEED
+
+    def get_feed_name(self):
+        return self.feed_name
+
+    def get_last_modified(self):
+        return self.feed_changed
+
+    def set_validators(self, response, etag, last_modified):
+        # Отметка ленты уже сдвинута записью, а реплика могла её ещё не
+        # получить: такой ответ нельзя подтверждать ответом 304.
+        if response.status_code == 200 and routers.read_from_replica():
+            patch_cache_control(response, no_cache=True)
+            return response
+        return super().set_validators(response, etag, last_modified)
+
+    def get_etag(self):
+        parts = [self.feed_changed.timestamp(), self.request.get_full_path()]
+        user = self.request.user
+        if user.is_authenticated:
+            parts += [user.pk, *get_versions(version_key('user', user.pk))]
+        return hashlib.md5(
+            ':'.join(map(str, parts)).encode()
+        ).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        feed = None
+        if request.method in ('GET', 'HEAD'):
+            feed = self.get_feed_name()
+        if feed is None:
+            return super().dispatch(request, *args, **kwargs)
+        self.feed_changed = get_feed_changed(feed)
+        return self.conditional_response(
+            request,
+            lambda: super(FeedConditionalMixin, self).dispatch(
+                request, *args, **kwargs
+            )
+        )
+
+
+class SerializedWriteMixin:
+    """Передаёт запись формы или удаление в очередь blogicum.writequeue.
+
+    Проверка формы и сохранение загруженных файлов выполняются в потоке
+    запроса: поток-писатель держит общую транзакцию и блокировку записи,
+    поэтому получает только save() или delete().
+    """
+
+    def save_files(self, instance):
+        for field in instance._meta.concrete_fields:
+            if not isinstance(field, models.FileField):
+                continue
+            file = getattr(instance, field.attname)
+            if file and not file._committed:
+                file.save(file.name, file.file, save=False)
+
+    def form_valid(self, form):
+        self.save_files(form.instance)
+        self.object = writequeue.run(form.save)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def delete(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        success_url = self.get_success_url()
+        writequeue.run(self.object.delete)
+        return HttpResponseRedirect(success_url)
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.utils import timezone
+
+from .thumbnails import variant_url
 
 User = get_user_model()
 
@@ -23,9 +24,7 @@ class CreatedPublishedModel(models.Model):
 class PostManager(models.Manager):
     def get_queryset(self):
         return super().get_queryset().filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lt=timezone.now()
+            is_visible=True
         )
 
 
@@ -68,6 +67,22 @@ class Post(CreatedPublishedModel):
         upload_to='posts_images',
         blank=True
     )
+    is_visible = models.BooleanField(
+        'Видна в лентах',
+        default=False,
+        editable=False,
+        help_text=('Вычисляется автоматически: публикация и категория '
+                   'опубликованы, время публикации наступило.')
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False
+    )
+    updated_at = models.DateTimeField(
+        'Изменено',
+        auto_now=True
+    )
     published_posts = PostManager()
     objects = models.Manager()
 
@@ -75,10 +90,44 @@ class Post(CreatedPublishedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', )
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'),
+                condition=models.Q(is_visible=True),
+                name='post_visible_feed_idx'
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                condition=models.Q(is_visible=True),
+                name='post_category_feed_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date', 'id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_visible=False),
+                name='post_scheduled_idx'
+            ),
+            # Список публикаций в админке и его date_hierarchy.
+            models.Index(
+                fields=('pub_date', 'id'),
+                name='post_pub_date_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
 
+    @property
+    def image_card_url(self):
+        return variant_url(self.image, 'card')
+
+    @property
+    def image_detail_url(self):
+        return variant_url(self.image, 'detail')
+
 
 class Category(CreatedPublishedModel):
     title = models.CharField(
@@ -141,3 +190,9 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx'
+            ),
+        )
@@ -1,17 +1,26 @@
+from django.db.models import Q
+
 from .models import Post
 
 
 def get_posts():
     return Post.objects.select_related(
         'location',
-        'author',
-        'category'
+        'author'
     )
 
 
 def get_published_posts():
     return Post.published_posts.select_related(
         'location',
-        'author',
-        'category'
+        'author'
     )
+
+
+def get_posts_visible_to(user):
+    # Автор видит свои публикации всегда, остальные — только видимые
+    # в лентах.
+    visible = Q(is_visible=True)
+    if user.is_authenticated:
+        visible |= Q(author=user)
+    return get_posts().filter(visible)
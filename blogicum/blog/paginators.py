@@ -0,0 +1,305 @@
+import base64
+import binascii
+import hashlib
+import json
+from collections.abc import Sequence
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import (EmptyPage, InvalidPage, Page,
+                                   PageNotAnInteger, Paginator)
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from blogicum import routers
+
+from .caching import get_generation
+
+NEXT = 'n'
+PREVIOUS = 'p'
+COUNT_KEY = 'blog:feed_count:{}:{}'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder обрезает микросекунды, а курсору нужна точная граница.
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} не сериализуется в курсор')
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, paginator,
+                 next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинатор: страницы адресуются курсором, а не номером.
+
+    Курсор хранит значения полей сортировки граничного объекта, поэтому
+    стоимость выборки не зависит от глубины страницы и не требует COUNT(*).
+    Последнее поле сортировки должно быть уникальным (обычно `id`).
+    """
+
+    template_name = 'includes/cursor_paginator.html'
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+
+    @staticmethod
+    def _field_name(order):
+        return order.lstrip('-')
+
+    def _reversed_ordering(self):
+        return tuple(
+            self._field_name(order) if order.startswith('-') else f'-{order}'
+            for order in self.ordering
+        )
+
+    def _keyset_filter(self, values, ordering):
+        condition = Q()
+        equal = {}
+        for order, value in zip(ordering, values):
+            name = self._field_name(order)
+            lookup = 'lt' if order.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def to_python(self, name, value):
+        return self.object_list.model._meta.get_field(name).to_python(value)
+
+    def fetch(self, values, ordering, limit):
+        """Первые limit объектов после границы values в порядке ordering."""
+        queryset = self.object_list
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, ordering))
+        return list(queryset.order_by(*ordering)[:limit])
+
+    def encode_cursor(self, direction, obj):
+        values = [
+            getattr(obj, self._field_name(order)) for order in self.ordering
+        ]
+        payload = json.dumps([direction, values], default=_encode_value)
+        return base64.urlsafe_b64encode(
+            payload.encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, raw_values = json.loads(
+                base64.urlsafe_b64decode(padded.encode())
+            )
+            if (direction not in (NEXT, PREVIOUS)
+                    or len(raw_values) != len(self.ordering)):
+                raise ValueError
+            values = [
+                self.to_python(self._field_name(order), value)
+                for order, value in zip(self.ordering, raw_values)
+            ]
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise InvalidCursor('Неверный курсор страницы.')
+        return direction, values
+
+    def page(self, cursor=None):
+        direction, values = NEXT, None
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+        ordering = (
+            self.ordering if direction == NEXT else self._reversed_ordering()
+        )
+        items = self.fetch(values, ordering, self.per_page + 1)
+        has_more = len(items) > self.per_page
+        items = items[:self.per_page]
+        if direction == NEXT:
+            has_next, has_previous = has_more, values is not None
+        else:
+            items.reverse()
+            has_next, has_previous = True, has_more
+        if not items:
+            return CursorPage(items, self)
+        return CursorPage(
+            items,
+            self,
+            next_cursor=(
+                self.encode_cursor(NEXT, items[-1]) if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(PREVIOUS, items[0])
+                if has_previous else None
+            ),
+        )
+
+
+class FeedPage(Page):
+    has_more = None
+
+    def has_next(self):
+        if self.has_more is not None:
+            return self.has_more
+        return super().has_next()
+
+
+class FeedPaginator(Paginator):
+    """Постраничный пагинатор лент с кэшированным числом записей.
+
+    Число записей хранится в кэше под ключом ленты и сбрасывается вместе с
+    поколением «feeds» при изменении публикаций и категорий. Если записей
+    больше count_limit, точный COUNT(*) не выполняется: пагинатор переходит
+    в режим «есть ещё», в котором о следующей странице узнаёт отдельным
+    запросом одной записи после страницы.
+    """
+
+    count_generation = 'feeds'
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True, count_key=None,
+                 count_limit=None):
+        super().__init__(object_list, per_page, orphans,
+                         allow_empty_first_page)
+        self.count_key = count_key
+        self.count_limit = count_limit
+        self.is_estimated = False
+
+    @cached_property
+    def count(self):
+        key = None
+        if self.count_key:
+            key = COUNT_KEY.format(
+                get_generation(self.count_generation), self.count_key
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                count, self.is_estimated = cached
+                return count
+        if self.count_limit:
+            count = self.object_list[:self.count_limit + 1].count()
+            self.is_estimated = count > self.count_limit
+            count = min(count, self.count_limit)
+        else:
+            count = super().count
+        if key and not routers.read_from_replica():
+            cache.set(
+                key,
+                (count, self.is_estimated),
+                settings.FEED_COUNT_CACHE_TIMEOUT
+            )
+        return count
+
+    def validate_number(self, number):
+        if not self.count or not self.is_estimated:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть целым.')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1.')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        # Срез остаётся QuerySet: списку админки с list_editable нужен
+        # queryset для формсета.
+        object_list = self.object_list[bottom:top]
+        if not object_list:
+            raise EmptyPage('На этой странице нет записей.')
+        page = self._get_page(object_list, number, self)
+        page.has_more = self.object_list[top:top + 1].exists()
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3,
+                              on_ends=2):
+        if not self.is_estimated:
+            yield from super().get_elided_page_range(
+                number, on_each_side=on_each_side, on_ends=on_ends
+            )
+            return
+        number = self.validate_number(number)
+        start = max(number - on_each_side, 1)
+        if start > on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+        else:
+            start = 1
+        yield from range(start, number + 1)
+        yield self.ELLIPSIS
+
+
+class EstimatedCountPaginator(FeedPaginator):
+    """Пагинатор списков админки для больших таблиц.
+
+    Число записей считается не дальше count_limit и кэшируется по тексту
+    SQL-запроса, поэтому повторное открытие списка не выполняет COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True):
+        super().__init__(
+            object_list,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            count_key=self.get_count_key(object_list),
+            count_limit=settings.ADMIN_COUNT_LIMIT
+        )
+
+    def get_count_key(self, object_list):
+        try:
+            sql = str(object_list.query)
+        except EmptyResultSet:
+            # Заведомо пустая выборка (например, .none() после поиска без
+            # слов) считается без запроса, кэшировать нечего.
+            return None
+        return 'admin:' + hashlib.md5(sql.encode()).hexdigest()
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3,
+                              on_ends=2):
+        # Админка не выводит ссылку «дальше», поэтому нужны номера и
+        # после текущей страницы — в пределах посчитанного числа записей.
+        return Paginator.get_elided_page_range(
+            self, number, on_each_side=on_each_side, on_ends=on_ends
+        )
+
+
+class CommentCountPaginator(EstimatedCountPaginator):
+    """Число комментариев сбрасывается при любом их изменении."""
+
+    count_generation = 'comments'
@@ -0,0 +1,118 @@
+"""Материализация видимости публикаций.
+
+Публикация видна в лентах, если она опубликована, её категория опубликована,
+а время публикации наступило. Вместо вычисления этого условия в каждом
+запросе флаг хранится в `Post.is_visible`: сохранение публикации или
+категории пересчитывает его сразу, а отложенные публикации включает
+планировщик, когда наступает их `pub_date`.
+"""
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Post
+
+NEXT_RUN_CACHE_KEY = 'blog:scheduler:next_run'
+NO_SCHEDULED_POSTS = datetime.max.replace(tzinfo=timezone.utc)
+
+# Отправляется после массового изменения видимости мимо Post.save();
+# providing_args: post_ids.
+visibility_changed = Signal()
+
+
+def visibility_condition(now):
+    return Q(
+        is_published=True,
+        category__is_published=True,
+        pub_date__lte=now
+    )
+
+
+def is_post_visible(post, now=None):
+    now = now or timezone.now()
+    return bool(
+        post.is_published
+        and post.category_id is not None
+        and post.category.is_published
+        and post.pub_date <= now
+    )
+
+
+def schedule(pub_date):
+    next_run = cache.get(NEXT_RUN_CACHE_KEY)
+    if next_run is not None and pub_date < next_run:
+        cache.set(
+            NEXT_RUN_CACHE_KEY, pub_date, settings.SCHEDULER_RECHECK_INTERVAL
+        )
+
+
+def _set_visibility(posts, is_visible):
+    post_ids = list(
+        posts.exclude(is_visible=is_visible).values_list('pk', flat=True)
+    )
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).update(is_visible=is_visible)
+        visibility_changed.send(sender=Post, post_ids=post_ids)
+    return post_ids
+
+
+def _reschedule(now):
+    next_run = Post.objects.filter(
+        is_visible=False,
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=now
+    ).aggregate(
+        next_run=Min('pub_date')
+    )['next_run']
+    cache.set(
+        NEXT_RUN_CACHE_KEY,
+        next_run or NO_SCHEDULED_POSTS,
+        settings.SCHEDULER_RECHECK_INTERVAL
+    )
+
+
+def publish_due_posts(now=None):
+    now = now or timezone.now()
+    post_ids = _set_visibility(
+        Post.objects.filter(is_visible=False).filter(
+            visibility_condition(now)
+        ),
+        True
+    )
+    _reschedule(now)
+    return post_ids
+
+
+def run_pending(now=None):
+    now = now or timezone.now()
+    next_run = cache.get(NEXT_RUN_CACHE_KEY)
+    if next_run is not None and next_run > now:
+        return []
+    return publish_due_posts(now)
+
+
+def sync_category(category, now=None):
+    now = now or timezone.now()
+    posts = Post.objects.filter(category=category)
+    if not category.is_published:
+        return _set_visibility(posts, False)
+    post_ids = _set_visibility(
+        posts.filter(visibility_condition(now)),
+        True
+    )
+    _reschedule(now)
+    return post_ids
+
+
+def sync_all(now=None):
+    now = now or timezone.now()
+    condition = visibility_condition(now)
+    post_ids = _set_visibility(Post.objects.filter(condition), True)
+    post_ids += _set_visibility(Post.objects.exclude(condition), False)
+    _reschedule(now)
+    return post_ids
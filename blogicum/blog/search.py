@@ -0,0 +1,103 @@
+"""Полнотекстовый поиск публикаций по индексу SQLite FTS5.
+
+Индекс blog_post_fts создаётся миграцией 0006_post_fts и синхронизируется
+триггерами. Результаты ранжируются BM25 (совпадение в заголовке весит
+больше) и листаются курсором по паре (ранг, id).
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+from .paginators import CursorPaginator
+
+FTS_TABLE = 'blog_post_fts'
+COMMENT_FTS_TABLE = 'blog_comment_fts'
+# Веса столбцов title и text для bm25().
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+MAX_TERMS = 10
+
+
+def build_match_expression(query, columns=None):
+    """Запрос посетителя -> выражение MATCH: все слова, каждое по префиксу.
+
+    Слова берутся в кавычки, поэтому операторы и спецсимволы FTS5 из
+    ввода не интерпретируются. columns ограничивает поиск столбцами.
+    """
+    terms = re.findall(r'\w+', query or '')[:MAX_TERMS]
+    expression = ' '.join(f'"{term}"*' for term in terms)
+    if expression and columns:
+        return f'{{{" ".join(columns)}}} : ({expression})'
+    return expression
+
+
+def match_ids(query, table=FTS_TABLE, columns=None):
+    """Подзапрос id строк, найденных в FTS-таблице table, или None."""
+    match = build_match_expression(query, columns)
+    if not match:
+        return None
+    return RawSQL(
+        f'SELECT rowid FROM {table} WHERE {table} MATCH %s', (match,)
+    )
+
+
+def match_filter(queryset, query, table=FTS_TABLE, columns=None):
+    """Сужает queryset до строк, найденных в FTS-таблице table."""
+    ids = match_ids(query, table, columns)
+    if ids is None:
+        return queryset.none()
+    return queryset.filter(pk__in=ids)
+
+
+class PostSearchPaginator(CursorPaginator):
+    """Курсорная пагинация результатов поиска в порядке релевантности.
+
+    object_list задаёт видимость: найденные id загружаются через него,
+    а в SQL отбираются только видимые в лентах публикации.
+    """
+
+    def __init__(self, object_list, per_page, query):
+        super().__init__(object_list, per_page, ordering=('search_rank', 'id'))
+        self.match = build_match_expression(query)
+
+    def to_python(self, name, value):
+        if name == 'search_rank':
+            return float(value)
+        return super().to_python(name, value)
+
+    def fetch(self, values, ordering, limit):
+        if not self.match:
+            return []
+        table = self.object_list.model._meta.db_table
+        direction = 'DESC' if ordering[0].startswith('-') else 'ASC'
+        params = [TITLE_WEIGHT, TEXT_WEIGHT, self.match]
+        keyset = ''
+        if values is not None:
+            operator = '<' if direction == 'DESC' else '>'
+            keyset = (
+                f'WHERE search_rank {operator} %s '
+                f'OR (search_rank = %s AND id {operator} %s)'
+            )
+            params += [values[0], values[0], values[1]]
+        params.append(limit)
+        sql = (
+            f'SELECT id, search_rank FROM ('
+            f'SELECT {FTS_TABLE}.rowid AS id, '
+            f'bm25({FTS_TABLE}, %s, %s) AS search_rank '
+            f'FROM {FTS_TABLE} '
+            f'JOIN {table} ON {table}.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND {table}.is_visible'
+            f') {keyset} '
+            f'ORDER BY search_rank {direction}, id {direction} LIMIT %s'
+        )
+        with connections[self.object_list.db].cursor() as cursor:
+            cursor.execute(sql, params)
+            ranks = cursor.fetchall()
+        posts = self.object_list.in_bulk([pk for pk, _ in ranks])
+        items = []
+        for pk, rank in ranks:
+            if pk in posts:
+                posts[pk].search_rank = rank
+                items.append(posts[pk])
+        return items
@@ -0,0 +1,191 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from jobs.queue import enqueue, worker_tick
+
+from . import scheduler, thumbnails
+from .caching import (ALL_FEEDS, bump_generation, bump_version, post_feeds,
+                      touch_feeds)
+from .models import Category, Comment, Location, Post
+
+VERSIONED_MODELS = {
+    Post: 'post',
+    Category: 'category',
+    Location: 'location',
+    get_user_model(): 'user',
+}
+
+
+def invalidate(func, *args):
+    """Сбрасывает кэш сейчас и ещё раз после COMMIT транзакции записи.
+
+    Первый сброс нужен самой транзакции: записав данные, она читает их
+    уже под новыми версиями. Запрос из другого соединения до COMMIT
+    прочитает старые строки и может сохранить их под этими версиями —
+    повторный сброс после COMMIT делает такие записи кэша недоступными.
+    """
+    func(*args)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(func, *args))
+
+
+@receiver(pre_save, sender=Post)
+def update_post_visibility(sender, instance, **kwargs):
+    instance.is_visible = scheduler.is_post_visible(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_publication(sender, instance, **kwargs):
+    if (instance.is_published and not instance.is_visible
+            and instance.pub_date > timezone.now()):
+        scheduler.schedule(instance.pub_date)
+
+
+@receiver(post_save, sender=Post)
+def generate_post_image_variants(sender, instance, raw=False, **kwargs):
+    if not raw and thumbnails.missing_variants(instance.image):
+        enqueue('blog.generate_thumbnails', {'post_id': instance.pk})
+
+
+@receiver(post_save, sender=Category)
+def update_category_posts_visibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        scheduler.sync_category(instance)
+
+
+@receiver(pre_delete, sender=Category)
+def hide_category_posts(sender, instance, **kwargs):
+    Post.objects.filter(
+        category=instance,
+        is_visible=True
+    ).update(is_visible=False)
+
+
+def _touch_post_feeds(post_ids):
+    feeds = set()
+    for category_id, username in Post.objects.filter(
+        pk__in=post_ids
+    ).values_list('category_id', 'author__username'):
+        feeds.update(post_feeds(category_id, username))
+    if feeds:
+        invalidate(touch_feeds, *feeds)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feeds(sender, instance, raw=False, **kwargs):
+    instance._previous_feeds = []
+    if instance.pk and not raw:
+        previous = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('category_id', 'author__username').first()
+        if previous:
+            instance._previous_feeds = post_feeds(*previous)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def touch_post_feeds(sender, instance, **kwargs):
+    invalidate(
+        touch_feeds,
+        *post_feeds(instance.category_id, instance.author.username),
+        *getattr(instance, '_previous_feeds', ())
+    )
+
+
+def _change_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        posts = posts.filter(comment_count__gte=-delta)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    instance._previous_post_id = None
+    if instance.pk and not raw:
+        instance._previous_post_id = Comment.objects.filter(
+            pk=instance.pk
+        ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count_on_save(sender, instance, created, raw=False,
+                                 **kwargs):
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        _change_comment_count(instance.post_id, 1)
+    elif previous_post_id and previous_post_id != instance.post_id:
+        _change_comment_count(previous_post_id, -1)
+        _change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_count_on_delete(sender, instance, **kwargs):
+    _change_comment_count(instance.post_id, -1)
+
+
+def bump_instance_version(sender, instance, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login — карточки от него
+    # не зависят.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate(bump_version, VERSIONED_MODELS[sender], instance.pk)
+    invalidate(bump_generation, 'pages')
+    if sender in (Post, Category):
+        invalidate(bump_generation, 'feeds')
+    if sender is Category:
+        invalidate(bump_generation, 'categories')
+    if sender is not Post:
+        invalidate(touch_feeds, ALL_FEEDS)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_pages_on_comment_change(sender, instance, **kwargs):
+    post_ids = {instance.post_id}
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if previous_post_id:
+        post_ids.add(previous_post_id)
+    for post_id in post_ids:
+        invalidate(bump_version, 'post_comments', post_id)
+    # Число комментариев выводится в карточках лент.
+    _touch_post_feeds(post_ids)
+    invalidate(bump_generation, 'pages')
+    # Число записей в списке комментариев админки.
+    invalidate(bump_generation, 'comments')
+
+
+@receiver(scheduler.visibility_changed)
+def invalidate_pages_on_visibility_change(sender, post_ids=(), **kwargs):
+    _touch_post_feeds(post_ids)
+    invalidate(bump_generation, 'pages')
+    invalidate(bump_generation, 'feeds')
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(
+        bump_instance_version,
+        sender=model,
+        dispatch_uid=f'bump_version_on_save_{model._meta.label_lower}'
+    )
+    post_delete.connect(
+        bump_instance_version,
+        sender=model,
+        dispatch_uid=f'bump_version_on_delete_{model._meta.label_lower}'
+    )
+
+
+@receiver(worker_tick)
+def publish_scheduled_posts(sender, **kwargs):
+    # Отложенные публикации включает исполнитель фоновых задач, а не
+    # запросы посетителей.
+    scheduler.run_pending()
@@ -0,0 +1,27 @@
+from django.core.management import call_command
+
+from jobs.queue import task
+
+from . import thumbnails
+from .caching import bump_generation, bump_version, post_feeds, touch_feeds
+from .models import Post
+
+
+@task('blog.generate_thumbnails')
+def generate_thumbnails(post_id, force=False):
+    post = Post.objects.select_related('author').filter(pk=post_id).first()
+    if post is None:
+        return []
+    created = thumbnails.generate_variants(post.image, force=force)
+    if created:
+        # Карточки и страницы, отрендеренные до появления вариантов,
+        # ссылаются на оригинал.
+        bump_version('post', post.pk)
+        bump_generation('pages')
+        touch_feeds(*post_feeds(post.category_id, post.author.username))
+    return created
+
+
+@task('blog.recount_comments')
+def recount_comments(batch_size=1000):
+    call_command('recount_comments', batch_size=batch_size)
@@ -0,0 +1,94 @@
+"""Дерево дат (date_hierarchy) в списках админки.
+
+Стандартный тег берёт границы через aggregate(Min, Max) и периоды через
+datetimes(), а SQLite выполняет оба запроса полным обходом таблицы с
+сортировкой по усечённой дате. Здесь тот же тег получает список, у
+которого первая и последняя даты ищутся запросами ORDER BY <поле> LIMIT 1
+по индексу поля, а периоды перечисляются между ними. Ссылка на период
+без записей ведёт на пустой список.
+"""
+import datetime
+
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+register = template.Library()
+
+
+def _truncate(value, kind):
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    if kind == 'year':
+        value = value.replace(month=1, day=1)
+    elif kind == 'month':
+        value = value.replace(day=1)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_period(start, kind):
+    aware = timezone.is_aware(start)
+    if aware:
+        start = timezone.make_naive(start)
+    if kind == 'year':
+        start = start.replace(year=start.year + 1)
+    elif kind == 'month':
+        start = (start.replace(day=28) + datetime.timedelta(days=4)).replace(
+            day=1
+        )
+    else:
+        start += datetime.timedelta(days=1)
+    return timezone.make_aware(start) if aware else start
+
+
+class IndexedDates:
+    """Отвечает на запросы тега date_hierarchy к cl.queryset."""
+
+    def __init__(self, queryset, field_name):
+        self.queryset = queryset
+        self.field_name = field_name
+
+    @cached_property
+    def bounds(self):
+        values = self.queryset.values_list(self.field_name, flat=True)
+        return {
+            'first': values.order_by(self.field_name).first(),
+            'last': values.order_by(f'-{self.field_name}').first(),
+        }
+
+    def aggregate(self, **kwargs):
+        # Тег запрашивает aggregate(first=Min(...), last=Max(...)).
+        return self.bounds
+
+    def datetimes(self, field_name, kind, **kwargs):
+        if self.bounds['first'] is None:
+            return []
+        period = _truncate(self.bounds['first'], kind)
+        periods = []
+        while period <= self.bounds['last']:
+            periods.append(period)
+            period = _next_period(period, kind)
+        return periods
+
+    dates = datetimes
+
+
+class IndexedDatesChangeList:
+    def __init__(self, cl):
+        self._cl = cl
+        self.queryset = IndexedDates(cl.queryset, cl.date_hierarchy)
+
+    def __getattr__(self, name):
+        return getattr(self._cl, name)
+
+
+@register.tag(name='indexed_date_hierarchy')
+def indexed_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser, token,
+        func=lambda cl: date_hierarchy(IndexedDatesChangeList(cl)),
+        template_name='date_hierarchy.html',
+        takes_context=False,
+    )
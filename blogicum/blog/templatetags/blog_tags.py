@@ -0,0 +1,41 @@
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog.caching import get_versions, version_key
+from blogicum import routers
+from blog.categories import category_cache
+
+register = template.Library()
+
+
+def post_card_cache_key(post):
+    versions = get_versions(
+        version_key('post', post.pk),
+        version_key('category', post.category_id),
+        version_key('location', post.location_id),
+        version_key('user', post.author_id),
+    )
+    return 'blog:post_card:{}:{}:{}'.format(
+        post.pk,
+        '.'.join(map(str, versions)),
+        post.comment_count
+    )
+
+
+@register.simple_tag
+def post_card(post):
+    key = post_card_cache_key(post)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string('includes/post_card.html', {'post': post})
+        if not routers.read_from_replica():
+            cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+@register.simple_tag
+def post_category(post):
+    return category_cache.get_by_id(post.category_id)
@@ -0,0 +1,91 @@
+"""Уменьшенные копии изображений публикаций.
+
+Для каждого варианта из settings.POST_IMAGE_VARIANTS рядом с оригиналом
+сохраняется JPEG с предсказуемым именем: `posts_images/photo.png` ->
+`posts_images/photo.card.jpg`. Поэтому URL варианта вычисляется по имени
+оригинала без обращения к базе.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITY = 85
+
+
+def variant_name(name, variant):
+    root, _ = os.path.splitext(name)
+    return f'{root}.{variant}.jpg'
+
+
+def variant_url(field_file, variant):
+    """URL варианта или оригинала, если вариант ещё не создан."""
+    if not field_file:
+        return ''
+    name = variant_name(field_file.name, variant)
+    if field_file.storage.exists(name):
+        return field_file.storage.url(name)
+    return field_file.url
+
+
+def _render(image, size):
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode != 'RGB':
+        # JPEG без прозрачности: прозрачные области заливаются белым.
+        background = Image.new('RGB', image.size, 'white')
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def missing_variants(field_file):
+    if not field_file:
+        return {}
+    return {
+        variant: name
+        for variant in settings.POST_IMAGE_VARIANTS
+        for name in [variant_name(field_file.name, variant)]
+        if not field_file.storage.exists(name)
+    }
+
+
+def generate_variants(field_file, force=False):
+    """Создаёт недостающие варианты; возвращает имена созданных файлов."""
+    if not field_file:
+        return []
+    storage = field_file.storage
+    if force:
+        pending = {
+            variant: variant_name(field_file.name, variant)
+            for variant in settings.POST_IMAGE_VARIANTS
+        }
+    else:
+        pending = missing_variants(field_file)
+    if not pending:
+        return []
+    created = []
+    try:
+        with storage.open(field_file.name, 'rb') as source:
+            original = Image.open(source)
+            original.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning(
+            'Не удалось открыть изображение %s', field_file.name,
+            exc_info=True
+        )
+        return created
+    for variant, name in pending.items():
+        content = _render(original, settings.POST_IMAGE_VARIANTS[variant])
+        if storage.exists(name):
+            storage.delete(name)
+        created.append(storage.save(name, content))
+    return created
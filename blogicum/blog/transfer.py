@@ -0,0 +1,115 @@
+"""Формат выгрузки и загрузки блога (команды export_blog и import_blog).
+
+Запись — словарь полей одной модели. Первичные ключи сохраняются, поэтому
+публикации ссылаются на категории, местоположения и другие записи по id,
+а авторы — по имени пользователя: пользователи не выгружаются.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date
+
+from django.utils import timezone
+
+from . import scheduler
+from .caching import ALL_FEEDS, bump_generation, touch_feeds
+from .models import Category, Comment, Location, Post
+
+# Порядок важен: записи ссылаются только на модели, выгруженные раньше.
+MODELS = {
+    'category': Category,
+    'location': Location,
+    'post': Post,
+    'comment': Comment,
+}
+
+FIELDS = {
+    'category': (
+        'id', 'title', 'description', 'slug', 'is_published', 'created_at'
+    ),
+    'location': ('id', 'name', 'is_published', 'created_at'),
+    'post': (
+        'id', 'title', 'text', 'pub_date', 'author', 'category', 'location',
+        'image', 'is_published', 'created_at'
+    ),
+    'comment': ('id', 'text', 'created_at', 'post', 'author'),
+}
+
+AUTHOR = 'author'
+
+
+def export_queryset(name):
+    """Записи модели name кортежами значений FIELDS[name] по порядку pk."""
+    model = MODELS[name]
+    lookups = []
+    for field_name in FIELDS[name]:
+        field = model._meta.get_field(field_name)
+        if field_name == AUTHOR:
+            lookups.append('author__username')
+        elif field.is_relation:
+            lookups.append(field.attname)
+        else:
+            lookups.append(field_name)
+    return model.objects.order_by('pk').values_list(*lookups)
+
+
+def to_json(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} не сериализуется в JSON')
+
+
+def dumps(record):
+    return json.dumps(record, ensure_ascii=False, default=to_json)
+
+
+def build_instance(name, record, user_ids):
+    """Объект модели по записи; user_ids — кэш «имя пользователя -> id»."""
+    model = MODELS[name]
+    kwargs = {}
+    for field_name in FIELDS[name]:
+        if field_name not in record:
+            if field_name == 'created_at':
+                kwargs[field_name] = timezone.now()
+            continue
+        value = record[field_name]
+        field = model._meta.get_field(field_name)
+        if field_name == AUTHOR:
+            kwargs['author_id'] = user_ids[value]
+        elif field.is_relation:
+            kwargs[field.attname] = int(value) if value not in (
+                None, ''
+            ) else None
+        else:
+            kwargs[field_name] = field.to_python(value)
+    return model(**kwargs)
+
+
+@contextmanager
+def keep_dates(model):
+    """Отключает auto_now_add, чтобы bulk_create сохранил даты из записей.
+
+    Записи без даты получают текущее время в build_instance.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def refresh_after_bulk_load():
+    """Обновляет видимость и кэши после записи пакетами bulk_create.
+
+    bulk_create минует сигналы: расписание отложенных публикаций, кэши
+    страниц и отметки лент обновляются один раз после загрузки.
+    """
+    scheduler.publish_due_posts()
+    for generation in ('pages', 'feeds', 'categories', 'comments'):
+        bump_generation(generation)
+    touch_feeds(ALL_FEEDS)
@@ -1,6 +1,7 @@
 from django.urls import path
+from django.utils.feedgenerator import Atom1Feed
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
@@ -15,6 +16,19 @@ urlpatterns = [
         views.UserListVieW.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.SyndicationView.as_view(feed_class=feeds.AuthorFeed),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.SyndicationView.as_view(
+            feed_class=feeds.AuthorFeed,
+            feed_type=Atom1Feed
+        ),
+        name='profile_atom'
+    ),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -25,6 +39,11 @@ urlpatterns = [
         views.PostDetailView.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostCommentsView.as_view(),
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/delete/',
         views.PostDeleteView.as_view(),
@@ -50,11 +69,39 @@ urlpatterns = [
         views.CommentDeleteView.as_view(),
         name='delete_comment'
     ),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search'
+    ),
     path(
         'category/<slug:category_slug>/',
         views.CategoryListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.SyndicationView.as_view(feed_class=feeds.CategoryFeed),
+        name='category_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.SyndicationView.as_view(
+            feed_class=feeds.CategoryFeed,
+            feed_type=Atom1Feed
+        ),
+        name='category_atom'
+    ),
+    path(
+        'rss/',
+        feeds.SyndicationView.as_view(),
+        name='index_rss'
+    ),
+    path(
+        'atom/',
+        feeds.SyndicationView.as_view(feed_type=Atom1Feed),
+        name='index_atom'
+    ),
     path(
         '',
         views.IndexListView.as_view(),
@@ -1,16 +1,26 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
+from django.db.models import OuterRef, Subquery
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.utils import timezone
+from django.utils.http import urlencode
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView)
 
+from .caching import author_feed, category_feed, get_versions, version_key
+from .categories import category_cache, get_published_category_or_404
 from .forms import CommentForm, PostForm, ProfileForm
-from .mixins import CommentMixin, PostMixin, PostUpdateDeleteMixin
-from .models import Category, Post, User
-from .modules import get_posts, get_published_posts
+from .mixins import (AnonymousPageCacheMixin, CommentMixin,
+                     CommentPaginationMixin, ConditionalGetMixin,
+                     FeedConditionalMixin, FeedPaginationMixin, PostMixin,
+                     PostUpdateDeleteMixin, SerializedWriteMixin)
+from .models import Comment, Post, User
+from .modules import get_posts, get_posts_visible_to, get_published_posts
+from .paginators import InvalidCursor
+from .search import PostSearchPaginator
 
 
 class ProfileUpdateView(
@@ -32,86 +42,165 @@ class ProfileUpdateView(
 
 
 class IndexListView(
+    FeedConditionalMixin,
+    AnonymousPageCacheMixin,
+    FeedPaginationMixin,
     ListView
 ):
     template_name = 'blog/index.html'
-    paginate_by = settings.COUNT_POSTS
+    query_budget = 4
+    read_replica = True
     queryset = get_published_posts(
-    ).annotate(
-        comment_count=Count("comments")
     ).order_by(
         '-pub_date'
     )
 
 
 class CategoryListView(
+    FeedConditionalMixin,
+    AnonymousPageCacheMixin,
+    FeedPaginationMixin,
     ListView
 ):
     template_name = 'blog/category.html'
-    paginate_by = settings.COUNT_POSTS
+    query_budget = 4
+    read_replica = True
+
+    def get_feed_name(self):
+        category = category_cache.get_by_slug(self.kwargs['category_slug'])
+        if category is None:
+            return None
+        return category_feed(category.pk)
 
     def get_queryset(self):
-        category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
+        self.category = get_published_category_or_404(
+            self.kwargs['category_slug']
         )
-        posts = category.posts.select_related(
-            'author',
-            'location',
-            'category'
+        return get_published_posts(
         ).filter(
-            is_published=True,
-            pub_date__lt=timezone.now(),
-        ).annotate(
-            comment_count=Count("comments")
+            category=self.category
         ).order_by(
             '-pub_date'
         )
-        return posts
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["category"] = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        context["category"] = self.category
+        return context
+
+
+class PostSearchView(
+    AnonymousPageCacheMixin,
+    FeedPaginationMixin,
+    ListView
+):
+    template_name = 'blog/search.html'
+    query_budget = 4
+
+    def uses_cursor_pagination(self):
+        return True
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return get_published_posts()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = PostSearchPaginator(queryset, page_size, self.query)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['pagination_query'] = urlencode({'q': self.query}) + '&'
         return context
 
 
 class PostDetailView(
+    ConditionalGetMixin,
+    CommentPaginationMixin,
     DetailView
 ):
     model = Post
     template_name = 'blog/detail.html'
+    query_budget = 5
+    read_replica = True
     pk_url_kwarg = 'post_id'
 
-    def get_object(self, queryset=None):
-        post = get_object_or_404(
-            get_posts(),
-            pk=self.kwargs[self.pk_url_kwarg]
-        )
-        if post.author == self.request.user:
-            return post
-        return get_object_or_404(
-            get_published_posts(),
-            pk=self.kwargs[self.pk_url_kwarg]
+    def get_queryset(self):
+        return get_posts_visible_to(
+            self.request.user
+        ).annotate(
+            last_comment_at=Subquery(
+                Comment.objects.filter(
+                    post=OuterRef('pk')
+                ).order_by(
+                    '-created_at'
+                ).values('created_at')[:1]
+            )
         )
 
+    def get_last_modified(self):
+        return max(filter(None, (
+            self.object.updated_at,
+            self.object.last_comment_at
+        )))
+
+    def get_etag(self):
+        post = self.object
+        user = self.request.user
+        parts = [
+            post.pk,
+            post.updated_at.isoformat(),
+            post.comment_count,
+            post.last_comment_at and post.last_comment_at.isoformat(),
+            *get_versions(
+                version_key('post', post.pk),
+                version_key('post_comments', post.pk),
+                version_key('category', post.category_id),
+                version_key('location', post.location_id),
+                version_key('user', post.author_id),
+            ),
+        ]
+        if user.is_authenticated:
+            # Страница содержит имя посетителя и форму с его CSRF-токеном.
+            parts += [
+                user.pk,
+                *get_versions(version_key('user', user.pk)),
+                self.request.META.get('CSRF_COOKIE'),
+            ]
+        return hashlib.md5(
+            ':'.join(map(str, parts)).encode()
+        ).hexdigest()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related(
-                'author'
-            )
-        )
         return context
 
 
+class PostCommentsView(
+    CommentPaginationMixin,
+    DetailView
+):
+    """Очередная порция комментариев HTML-фрагментом для «Показать ещё»."""
+
+    model = Post
+    template_name = 'includes/comment_list.html'
+    query_budget = 4
+    read_replica = True
+    pk_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return get_posts_visible_to(self.request.user)
+
+
 class PostCreateView(
     LoginRequiredMixin,
+    SerializedWriteMixin,
     PostMixin,
     CreateView
 ):
@@ -128,6 +217,7 @@ class PostCreateView(
 class PostUpdateView(
     LoginRequiredMixin,
     UserPassesTestMixin,
+    SerializedWriteMixin,
     PostMixin,
     PostUpdateDeleteMixin,
     UpdateView
@@ -150,6 +240,7 @@ class PostUpdateView(
 class PostDeleteView(
     LoginRequiredMixin,
     UserPassesTestMixin,
+    SerializedWriteMixin,
     PostMixin,
     PostUpdateDeleteMixin,
     DeleteView
@@ -175,17 +266,27 @@ class PostDeleteView(
 
 
 class UserListVieW(
+    FeedConditionalMixin,
+    AnonymousPageCacheMixin,
+    FeedPaginationMixin,
     ListView
 ):
     template_name = 'blog/profile.html'
-    paginate_by = settings.COUNT_POSTS
+    query_budget = 5
+    read_replica = True
+
+    def get_feed_name(self):
+        return author_feed(self.kwargs['username'])
+
+    def get_count_cache_key(self):
+        if str(self.request.user) == self.kwargs['username']:
+            return f'{self.request.path}:owner'
+        return self.request.path
 
     def get_queryset(self):
         queryset = get_posts(
         ).filter(
             author__username=self.kwargs['username']
-        ).annotate(
-            comment_count=Count("comments")
         ).order_by(
             '-pub_date'
         )
@@ -194,8 +295,6 @@ class UserListVieW(
         return get_published_posts(
         ).filter(
             author__username=self.kwargs['username']
-        ).annotate(
-            comment_count=Count("comments")
         ).order_by(
             '-pub_date'
         )
@@ -211,6 +310,7 @@ class UserListVieW(
 
 class CommentCreateView(
     LoginRequiredMixin,
+    SerializedWriteMixin,
     CommentMixin,
     CreateView
 ):
@@ -232,6 +332,7 @@ class CommentCreateView(
 class CommentUpdateView(
     LoginRequiredMixin,
     UserPassesTestMixin,
+    SerializedWriteMixin,
     CommentMixin,
     UpdateView
 ):
@@ -255,6 +356,7 @@ class CommentUpdateView(
 class CommentDeleteView(
     LoginRequiredMixin,
     UserPassesTestMixin,
+    SerializedWriteMixin,
     CommentMixin,
     DeleteView
 ):
@@ -0,0 +1,95 @@
+"""Чтение с реплик базы данных.
+
+Реплики перечислены в settings.DATABASE_REPLICAS и содержат копию
+default (см. команду sync_replica). Запросы уходят на реплику только в
+пределах запроса, который ReplicaRoutingMiddleware пометил как читающий:
+GET к представлению с атрибутом read_replica = True. Пользователь,
+только что записавший данные, какое-то время читает с default, чтобы
+сразу увидеть свою публикацию или комментарий несмотря на отставание
+реплики.
+
+Ключи кэшей сбрасываются записью в default, а реплика догоняет её позже.
+Поэтому то, что построено по чтениям с реплики (read_from_replica()), в
+кэши не сохраняется.
+"""
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+
+DEFAULT_DB_ALIAS = 'default'
+
+_local = Local()
+
+
+class RequestScope:
+    __slots__ = ('replica', 'wrote', 'replica_reads')
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+        self.replica_reads = False
+
+
+@contextmanager
+def request_scope():
+    """Состояние маршрутизации на время обработки одного запроса."""
+    previous = getattr(_local, 'scope', None)
+    scope = _local.scope = RequestScope()
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
+
+
+def current_scope():
+    return getattr(_local, 'scope', None)
+
+
+@contextmanager
+def bind_scope(scope):
+    """Выполняет код другого потока в состоянии маршрутизации запроса."""
+    previous = getattr(_local, 'scope', None)
+    _local.scope = scope
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
+
+
+def use_replica():
+    """Направляет чтения текущего запроса на одну из реплик."""
+    scope = getattr(_local, 'scope', None)
+    if scope is not None and settings.DATABASE_REPLICAS:
+        scope.replica = random.choice(settings.DATABASE_REPLICAS)
+    return scope and scope.replica
+
+
+def read_from_replica():
+    """Были ли в текущем запросе чтения с реплики."""
+    scope = getattr(_local, 'scope', None)
+    return scope is not None and scope.replica_reads
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = getattr(_local, 'scope', None)
+        if scope is not None and not scope.wrote and scope.replica:
+            scope.replica_reads = True
+            return scope.replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        scope = getattr(_local, 'scope', None)
+        if scope is not None:
+            scope.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии default, объекты из любой базы совместимы.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплик приходит вместе с данными из default.
+        return db not in settings.DATABASE_REPLICAS
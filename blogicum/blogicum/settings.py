@@ -13,6 +13,45 @@ ALLOWED_HOSTS = [
 
 COUNT_POSTS = 10
 
+COUNT_COMMENTS = 20
+
+# 'cursor' — keyset-пагинация лент без COUNT(*), 'offset' — постраничная.
+FEED_PAGINATION = 'cursor'
+
+# Для режима 'offset': сколько хранить число записей ленты и после какого
+# числа записей пагинатор перестаёт считать их точно («есть ещё»).
+FEED_COUNT_CACHE_TIMEOUT = 60 * 15
+
+FEED_COUNT_LIMIT = 10000
+
+# Списки админки считают записи не дальше этого числа.
+ADMIN_COUNT_LIMIT = 100000
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Уменьшенные копии Post.image: вариант -> (ширина, высота) вписанной рамки.
+POST_IMAGE_VARIANTS = {
+    'card': (640, 640),
+    'detail': (1280, 1280),
+}
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Отложенные публикации включает run_jobs (или publish_scheduled --loop).
+# Как долго процесс доверяет кэшированному времени ближайшей отложенной
+# публикации. Кэш у каждого процесса свой, а отложенные публикации могут
+# появиться в другом процессе (второй воркер, загрузка, shell).
+SCHEDULER_RECHECK_INTERVAL = 30
+
+# RSS/Atom: число последних публикаций в ленте и срок хранения готового
+# ответа. Ключ кэша включает отметку изменения ленты, поэтому срок может
+# быть большим.
+SYNDICATION_ITEMS = 20
+
+SYNDICATION_CACHE_TIMEOUT = 60 * 60 * 24
+
+CATEGORY_CACHE_SIZE = 256
+
 STATICFILES_DIRS = [
     BASE_DIR / 'static_dev'
 ]
@@ -29,10 +68,13 @@ INSTALLED_APPS = [
 
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'jobs.apps.JobsConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.QueryBudgetMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -68,10 +110,75 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'blogicum.wsgi.application'
 
+# Соединения живут CONN_MAX_AGE секунд и переиспользуются запросами
+# воркера: подключение и PRAGMA выполняются раз в минуту, а не на каждый
+# запрос. CONN_HEALTH_CHECKS проверяет соединение перед первым запросом.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # Копия default, которую обновляет manage.py sync_replica.
+    'replica': {
+        'ENGINE': 'blogicum.sqlite',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'PRAGMAS': {
+            'query_only': 'on',
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+# Реплики для чтения лент, страниц публикаций и статических страниц,
+# например ['replica'] после первого запуска sync_replica.
+DATABASE_REPLICAS = []
+
+# Сколько секунд после записи пользователь читает только с default; должно
+# превышать отставание реплик (интервал sync_replica --interval).
+REPLICA_STICKY_SECONDS = 30
+
+# Очередь записи (blogicum/writequeue.py): POST-обработчики публикаций,
+# комментариев и list_editable админки выполняются одним потоком процесса
+# группами до WRITE_QUEUE_BATCH_SIZE в одной транзакции.
+WRITE_QUEUE_ENABLED = False
+
+WRITE_QUEUE_BATCH_SIZE = 50
+
+# Сколько секунд писатель ждёт пополнения группы.
+WRITE_QUEUE_MAX_DELAY = 0.005
+
+WRITE_QUEUE_TIMEOUT = 30
+
+# Общая блокировка писателей всех процессов.
+WRITE_QUEUE_LOCK_FILE = BASE_DIR / 'write.lock'
+
+# Выполняются при каждом соединении бэкенда blogicum.sqlite; ключ 'PRAGMAS'
+# в настройках базы дополняет их. WAL позволяет читать во время записи,
+# busy_timeout — ждать блокировку вместо «database is locked».
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 'normal',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+
+# Кэш общий для всех процессов только у файлового (или внешнего) бэкенда:
+# при нескольких воркерах замените LocMemCache на
+# 'django.core.cache.backends.filebased.FileBasedCache' с общим LOCATION.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
     }
 }
 
@@ -108,10 +215,29 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# Письма ставятся в очередь фоновых задач, а исполнитель (run_jobs)
+# отправляет их через JOBS_EMAIL_BACKEND.
+EMAIL_BACKEND = 'jobs.mail.QueuedEmailBackend'
+
+JOBS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Фоновые задачи. JOBS_RUN_INLINE выполняет задачи сразу после фиксации
+# транзакции — для разработки без запущенного run_jobs.
+JOBS_RUN_INLINE = False
+
+JOBS_WORKERS = 4
+
+JOBS_POLL_INTERVAL = 1
+
+JOBS_MAX_ATTEMPTS = 5
+
+# Задержка перед повтором: JOBS_RETRY_DELAY * 2 ** (попытка - 1) секунд.
+JOBS_RETRY_DELAY = 10
+
+JOBS_STALE_AFTER = 60 * 10
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = '/auth/login/'
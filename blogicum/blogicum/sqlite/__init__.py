@@ -0,0 +1,127 @@
+"""Бэкенд SQLite с настройкой соединений.
+
+Подключается как ENGINE 'blogicum.sqlite' и отличается от стандартного
+тремя вещами:
+
+* при каждом новом соединении выполняет PRAGMA из settings.SQLITE_PRAGMAS,
+  дополненные ключом 'PRAGMAS' настроек конкретной базы в DATABASES;
+* OPTIONS['transaction_mode'] задаёт вид BEGIN для transaction.atomic()
+  так же, как в Django 5.1, а immediate() — только для одной транзакции.
+  С 'IMMEDIATE' транзакция сразу берёт блокировку записи и ждёт её
+  busy_timeout; обычный BEGIN при первой записи после чтения получает
+  «database is locked» без ожидания, зато читающие транзакции не
+  занимают блокировку записи;
+* с CONN_HEALTH_CHECKS (как в Django 4.1) постоянное соединение
+  (CONN_MAX_AGE) перед первым использованием в запросе проверяется
+  запросом SELECT 1 и при ошибке открывается заново.
+
+Статистику соединений процесса возвращает connection_stats().
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+# Только параметры уровня соединения и журнала: прочие PRAGMA меняют
+# формат файла или семантику запросов и в настройки не выносятся.
+ALLOWED_PRAGMAS = frozenset({
+    'journal_mode',
+    'busy_timeout',
+    'synchronous',
+    'cache_size',
+    'mmap_size',
+    'temp_store',
+    'wal_autocheckpoint',
+    'journal_size_limit',
+    'foreign_keys',
+    'query_only',
+})
+
+TRANSACTION_MODES = frozenset({'DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'})
+
+VALUE_RE = re.compile(r'^-?\w+$')
+
+
+def get_pragmas(settings_dict):
+    pragmas = {
+        **getattr(settings, 'SQLITE_PRAGMAS', {}),
+        **settings_dict.get('PRAGMAS', {}),
+    }
+    for name, value in pragmas.items():
+        if name not in ALLOWED_PRAGMAS:
+            raise ImproperlyConfigured(f'Неизвестный параметр PRAGMA {name}.')
+        if not VALUE_RE.match(str(value)):
+            raise ImproperlyConfigured(
+                f'Недопустимое значение PRAGMA {name}: {value!r}.'
+            )
+    return pragmas
+
+
+def get_transaction_mode(options):
+    mode = options.get('transaction_mode')
+    if mode is not None and mode.upper() not in TRANSACTION_MODES:
+        raise ImproperlyConfigured(
+            f'Недопустимый transaction_mode {mode!r}: ожидается один из '
+            f'{", ".join(sorted(TRANSACTION_MODES))}.'
+        )
+    return mode and mode.upper()
+
+
+@contextmanager
+def immediate(using=None):
+    """transaction.atomic(), которая в SQLite начинается с BEGIN IMMEDIATE.
+
+    Для путей записи. Внутри уже открытой транзакции работает как обычная
+    вложенная atomic().
+    """
+    connection = transaction.get_connection(using)
+    outermost = not connection.in_atomic_block
+    if outermost:
+        connection.begin_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using):
+            yield
+    finally:
+        if outermost:
+            connection.begin_mode = None
+
+
+class ConnectionStats:
+    """Счётчики соединений процесса по псевдонимам баз."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(Counter)
+
+    def add(self, alias, **values):
+        with self._lock:
+            self._counters[alias].update(values)
+
+    def snapshot(self):
+        with self._lock:
+            counters = {
+                alias: dict(counter)
+                for alias, counter in self._counters.items()
+            }
+        for counter in counters.values():
+            opened = counter.get('opened', 0)
+            setup_seconds = counter.pop('setup_seconds', 0)
+            counter['avg_setup_ms'] = round(
+                setup_seconds * 1000 / opened, 3
+            ) if opened else 0
+        return counters
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+stats = ConnectionStats()
+
+
+def connection_stats():
+    return stats.snapshot()
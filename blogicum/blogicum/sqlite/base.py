@@ -0,0 +1,73 @@
+import time
+
+from django.db.backends.sqlite3 import base
+
+from . import get_pragmas, get_transaction_mode, stats
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    transaction_mode = None
+    # Вид BEGIN для ближайшей транзакции, его задаёт immediate().
+    begin_mode = None
+    health_check_done = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.transaction_mode = get_transaction_mode(params)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        started = time.perf_counter()
+        conn = super().get_new_connection(conn_params)
+        for name, value in get_pragmas(self.settings_dict).items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        stats.add(
+            self.alias,
+            opened=1,
+            setup_seconds=time.perf_counter() - started
+        )
+        return conn
+
+    def connect(self):
+        # Только что открытое соединение не проверяется.
+        self.health_check_done = True
+        super().connect()
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.begin_mode or self.transaction_mode
+        if mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f'BEGIN {mode}')
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except base.Database.Error:
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        # Вызывается в начале и в конце каждого запроса: следующее
+        # использование соединения снова начнётся с проверки.
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if self.connection is not None and not self.health_check_done:
+            self.health_check_done = True
+            if not self.settings_dict.get('CONN_HEALTH_CHECKS'):
+                stats.add(self.alias, reused=1)
+            elif not self.in_atomic_block and not self.is_usable():
+                stats.add(self.alias, failed_checks=1)
+                self.close()
+            else:
+                stats.add(self.alias, reused=1, checks=1)
+        super().ensure_connection()
+
+    def close(self):
+        was_open = self.connection is not None
+        super().close()
+        if was_open and self.connection is None:
+            stats.add(self.alias, closed=1)
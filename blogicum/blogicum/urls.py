@@ -7,6 +7,8 @@ from django.views.generic.edit import CreateView
 
 from blog.models import User
 
+from . import views
+
 extra_patterns = [
     path(
         'registration/',
@@ -35,6 +37,11 @@ urlpatterns = [
             extra_patterns,
         )
     ),
+    path(
+        'metrics/',
+        views.metrics,
+        name='metrics'
+    ),
     path(
         'pages/',
         include(
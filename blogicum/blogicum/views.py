@@ -0,0 +1,17 @@
+import os
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from .sqlite import connection_stats
+from .writequeue import write_queue
+
+
+@staff_member_required
+def metrics(request):
+    """Метрики воркера, обработавшего запрос, для персонала (JSON)."""
+    return JsonResponse({
+        'pid': os.getpid(),
+        'connections': connection_stats(),
+        'write_queue': write_queue.metrics(),
+    })
@@ -0,0 +1,222 @@
+"""Последовательная запись в SQLite через один поток процесса.
+
+SQLite допускает одного писателя: при всплеске POST-запросов они ждут
+блокировку по busy_timeout и каждый платит за свой COMMIT. Если
+settings.WRITE_QUEUE_ENABLED включён, run() передаёт функцию записи
+потоку-писателю процесса. Тот собирает до WRITE_QUEUE_BATCH_SIZE ожидающих
+функций (ждёт новые не дольше WRITE_QUEUE_MAX_DELAY секунд) и выполняет
+их в одной транзакции, каждую в своей точке сохранения: ошибка одной
+функции откатывает только её изменения. Между процессами писатели
+чередуются по блокировке файла WRITE_QUEUE_LOCK_FILE (fcntl.flock), а не
+по busy_timeout SQLite.
+
+Результат возвращается вызывающему потоку только после COMMIT.
+"""
+import os
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+
+from . import routers, sqlite
+
+try:
+    import fcntl
+except ImportError:  # Windows: только последовательность внутри процесса.
+    fcntl = None
+
+# Сколько последних групп учитывать в задержках metrics().
+SAMPLES = 1000
+
+
+class Job:
+    __slots__ = ('func', 'args', 'kwargs', 'scope', 'future', 'queued_at')
+
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.scope = routers.current_scope()
+        self.future = Future()
+        self.queued_at = time.monotonic()
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def _summary(samples):
+    values = [value * 1000 for value in samples]
+    return {
+        'p50_ms': round(_percentile(values, 50), 3),
+        'p95_ms': round(_percentile(values, 95), 3),
+        'max_ms': round(max(values, default=0.0), 3),
+    }
+
+
+class WriteQueue:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._queue = queue.Queue()
+        self._lock_file = None
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.max_depth = 0
+        self.groups = 0
+        self.jobs = 0
+        self.failed = 0
+        self.group_sizes = deque(maxlen=SAMPLES)
+        self.lock_waits = deque(maxlen=SAMPLES)
+        self.commit_times = deque(maxlen=SAMPLES)
+        self.queue_waits = deque(maxlen=SAMPLES)
+
+    def is_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, func, *args, **kwargs):
+        self._ensure_writer()
+        job = Job(func, args, kwargs)
+        self._queue.put(job)
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return job.future
+
+    def _ensure_writer(self):
+        with self._lock:
+            # После fork у дочернего процесса нет потока родителя.
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            # flock общий у копий одного дескриптора: файл открывается
+            # заново в каждом процессе.
+            self._lock_file = None
+            self._thread = threading.Thread(
+                target=self._serve, name='write-queue', daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + settings.WRITE_QUEUE_MAX_DELAY
+        while len(batch) < settings.WRITE_QUEUE_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(
+                    self._queue.get(timeout=timeout) if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _serve(self):
+        while True:
+            batch = self._collect()
+            close_old_connections()
+            try:
+                self._commit(batch)
+            except Exception as error:
+                for job in batch:
+                    if not job.future.done():
+                        job.future.set_exception(error)
+
+    @contextmanager
+    def _process_lock(self):
+        if fcntl is None:
+            yield
+            return
+        path = str(settings.WRITE_QUEUE_LOCK_FILE)
+        if self._lock_file is None or self._lock_file.name != path:
+            if self._lock_file is not None:
+                self._lock_file.close()
+            self._lock_file = open(path, 'a+b')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _commit(self, batch):
+        started = time.monotonic()
+        results = []
+        with self._process_lock():
+            locked = time.monotonic()
+            with sqlite.immediate():
+                for job in batch:
+                    if not job.future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic(), routers.bind_scope(
+                            job.scope
+                        ):
+                            results.append(
+                                (job, job.func(*job.args, **job.kwargs), None)
+                            )
+                    except Exception as error:
+                        results.append((job, None, error))
+            committed = time.monotonic()
+        for job, result, error in results:
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+        with self._lock:
+            self.groups += 1
+            self.jobs += len(results)
+            self.failed += sum(1 for _, _, error in results if error)
+            self.group_sizes.append(len(results))
+            self.lock_waits.append(locked - started)
+            self.commit_times.append(committed - locked)
+            self.queue_waits.extend(
+                started - job.queued_at for job, _, _ in results
+            )
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'enabled': settings.WRITE_QUEUE_ENABLED,
+                'pid': os.getpid(),
+                'depth': self._queue.qsize(),
+                'max_depth': self.max_depth,
+                'groups': self.groups,
+                'jobs': self.jobs,
+                'failed': self.failed,
+                'avg_group_size': round(
+                    statistics.mean(self.group_sizes), 2
+                ) if self.group_sizes else 0,
+                'queue_wait': _summary(self.queue_waits),
+                'lock_wait': _summary(self.lock_waits),
+                'commit': _summary(self.commit_times),
+            }
+
+
+write_queue = WriteQueue()
+
+
+def run(func, *args, **kwargs):
+    """Выполняет функцию записи через очередь и возвращает её результат.
+
+    Без WRITE_QUEUE_ENABLED, внутри открытой транзакции (иначе писатель
+    ждал бы её блокировку) и в самом потоке-писателе функция выполняется
+    сразу в sqlite.immediate().
+    """
+    if (
+        not settings.WRITE_QUEUE_ENABLED
+        or connection.in_atomic_block
+        or write_queue.is_writer_thread()
+    ):
+        with sqlite.immediate():
+            return func(*args, **kwargs)
+    future = write_queue.submit(func, *args, **kwargs)
+    return future.result(timeout=settings.WRITE_QUEUE_TIMEOUT)
@@ -0,0 +1,47 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'name',
+        'status',
+        'priority',
+        'attempts',
+        'run_at',
+        'created_at',
+        'finished_at',
+    )
+    list_filter = (
+        'status',
+        'name',
+    )
+    search_fields = (
+        'name',
+    )
+    readonly_fields = (
+        'attempts',
+        'created_at',
+        'started_at',
+        'finished_at',
+        'worker',
+        'last_error',
+    )
+    actions = (
+        'requeue',
+    )
+
+    @admin.action(description='Повторить выбранные задачи')
+    def requeue(self, request, queryset):
+        updated = queryset.exclude(
+            status=Job.RUNNING
+        ).update(
+            status=Job.QUEUED,
+            attempts=0,
+            run_at=timezone.now(),
+            finished_at=None
+        )
+        self.message_user(request, f'Возвращено в очередь задач: {updated}.')
@@ -0,0 +1,82 @@
+import base64
+
+from django.conf import settings
+from django.core.mail import (EmailMessage, EmailMultiAlternatives,
+                              get_connection)
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import Job
+from .queue import enqueue
+
+
+def serialize_message(message):
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError(
+                'Очередь писем поддерживает только вложения, заданные '
+                'кортежем (filename, content, mimetype).'
+            )
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append(
+            [filename, base64.b64encode(content).decode(), mimetype]
+        )
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+        'attachments': attachments,
+        'content_subtype': message.content_subtype,
+    }
+
+
+def deserialize_message(data, connection=None):
+    data = dict(data)
+    alternatives = data.pop('alternatives')
+    attachments = data.pop('attachments')
+    content_subtype = data.pop('content_subtype')
+    cls = EmailMultiAlternatives if alternatives else EmailMessage
+    message = cls(connection=connection, **data)
+    for content, mimetype in alternatives:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype in attachments:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    message.content_subtype = content_subtype
+    return message
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь задач вместо отправки во время запроса.
+
+    Письма отправляет исполнитель через JOBS_EMAIL_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        sent = 0
+        for message in email_messages:
+            if not message.recipients():
+                continue
+            try:
+                enqueue(
+                    'jobs.send_email',
+                    serialize_message(message),
+                    priority=Job.PRIORITY_HIGH
+                )
+            except Exception:
+                if not self.fail_silently:
+                    raise
+                continue
+            sent += 1
+        return sent
+
+
+def get_delivery_connection():
+    return get_connection(settings.JOBS_EMAIL_BACKEND)
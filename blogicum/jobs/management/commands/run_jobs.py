@@ -0,0 +1,64 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs import queue
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди: повторяет упавшие с '
+        'задержкой, сначала берёт задачи с большим приоритетом.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.JOBS_WORKERS,
+            help='Число потоков, выполняющих задачи одновременно.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.JOBS_POLL_INTERVAL,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+        parser.add_argument(
+            '--name',
+            action='append',
+            dest='names',
+            help='Выполнять только задачи с этим обработчиком; '
+                 'можно указать несколько раз.'
+        )
+
+    def handle(self, *args, workers, once, interval, names, **options):
+        if workers < 1:
+            raise CommandError('--workers должен быть положительным.')
+        worker = queue.worker_name()
+        total = 0
+        while True:
+            for receiver, error in queue.worker_tick.send_robust(Command):
+                if isinstance(error, Exception):
+                    self.stderr.write(f'{receiver.__name__}: {error!r}')
+            requeued = queue.requeue_stale()
+            if requeued:
+                self.stderr.write(
+                    f'Возвращено в очередь зависших задач: {requeued}.'
+                )
+            done = queue.run_pending(workers=workers, names=names,
+                                     worker=worker)
+            total += done
+            if once and not done:
+                break
+            if not done:
+                time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Выполнено задач: {total}.'
+        ))
@@ -0,0 +1,95 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    PRIORITY_LOW = -10
+    PRIORITY_NORMAL = 0
+    PRIORITY_HIGH = 10
+
+    name = models.CharField(
+        'Обработчик',
+        max_length=128
+    )
+    payload = models.JSONField(
+        'Аргументы',
+        default=dict,
+        blank=True
+    )
+    priority = models.SmallIntegerField(
+        'Приоритет',
+        default=PRIORITY_NORMAL,
+        help_text='Задачи с большим приоритетом выполняются раньше.'
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток',
+        default=0
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        'Максимум попыток',
+        default=5
+    )
+    run_at = models.DateTimeField(
+        'Выполнить не раньше',
+        default=timezone.now
+    )
+    created_at = models.DateTimeField(
+        'Добавлено',
+        auto_now_add=True
+    )
+    started_at = models.DateTimeField(
+        'Начало последней попытки',
+        null=True,
+        blank=True
+    )
+    finished_at = models.DateTimeField(
+        'Завершено',
+        null=True,
+        blank=True
+    )
+    worker = models.CharField(
+        'Исполнитель',
+        max_length=128,
+        blank=True
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('-id',)
+        indexes = (
+            models.Index(
+                fields=('-priority', 'run_at', 'id'),
+                condition=models.Q(status='queued'),
+                name='job_queued_idx'
+            ),
+            models.Index(
+                fields=('started_at',),
+                condition=models.Q(status='running'),
+                name='job_running_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
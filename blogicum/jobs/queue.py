@@ -0,0 +1,183 @@
+"""Очередь фоновых задач в базе данных проекта.
+
+Задача — строка Job с именем обработчика и JSON-аргументами. Обработчики
+регистрируются декоратором `task` в модулях tasks.py приложений, задачи
+ставятся в очередь функцией `enqueue` и выполняются командой
+`manage.py run_jobs`. Внешний брокер не нужен: исполнители забирают задачи
+условным UPDATE, поэтому одну задачу не выполнят двое.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+# Отправляется run_jobs на каждом круге опроса очереди: приложения
+# подключают к нему свою периодическую работу.
+worker_tick = Signal()
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+def task(name):
+    """Регистрирует функцию как обработчик задач с именем name."""
+    def decorator(func):
+        if _handlers.get(name, func) is not func:
+            raise ValueError(f'Обработчик задачи {name} уже объявлен.')
+        _handlers[name] = func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return _handlers[name]
+    except KeyError:
+        raise UnknownTask(f'Нет обработчика задачи {name}.')
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def enqueue(name, payload=None, *, priority=Job.PRIORITY_NORMAL,
+            run_at=None, max_attempts=None):
+    """Ставит задачу в очередь и возвращает её.
+
+    При JOBS_RUN_INLINE задача выполняется сразу после фиксации текущей
+    транзакции — удобно для разработки без запущенного исполнителя.
+    """
+    get_handler(name)
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS
+    )
+    if settings.JOBS_RUN_INLINE:
+        transaction.on_commit(lambda: claim_and_run(job.pk))
+    return job
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def claim(job_id, worker=None):
+    """Забирает задачу из очереди; False, если её уже забрал другой."""
+    now = timezone.now()
+    return bool(
+        Job.objects.filter(
+            pk=job_id,
+            status=Job.QUEUED,
+        ).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            started_at=now,
+            worker=worker or worker_name()
+        )
+    )
+
+
+def run(job):
+    """Выполняет забранную задачу и записывает результат."""
+    try:
+        get_handler(job.name)(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Задача %s завершилась с ошибкой', job)
+        if job.attempts < job.max_attempts:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.QUEUED,
+                run_at=timezone.now() + _retry_delay(job.attempts),
+                last_error=error
+            )
+        else:
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.FAILED,
+                finished_at=timezone.now(),
+                last_error=error
+            )
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.DONE,
+        finished_at=timezone.now()
+    )
+    return True
+
+
+def claim_and_run(job_id, worker=None):
+    if not claim(job_id, worker):
+        return None
+    return run(Job.objects.get(pk=job_id))
+
+
+def due_jobs(limit, names=None):
+    jobs = Job.objects.filter(
+        status=Job.QUEUED,
+        run_at__lte=timezone.now()
+    )
+    if names:
+        jobs = jobs.filter(name__in=names)
+    return list(
+        jobs.order_by(
+            '-priority',
+            'run_at',
+            'id'
+        ).values_list('pk', flat=True)[:limit]
+    )
+
+
+def requeue_stale(now=None):
+    """Возвращает в очередь задачи исполнителей, завершившихся аварийно."""
+    now = now or timezone.now()
+    return Job.objects.filter(
+        status=Job.RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.JOBS_STALE_AFTER)
+    ).update(
+        status=Job.QUEUED,
+        run_at=now,
+        last_error='Исполнитель не завершил задачу вовремя.'
+    )
+
+
+def _run_in_thread(job_id, worker):
+    try:
+        return claim_and_run(job_id, worker)
+    finally:
+        # У каждого потока своё соединение с базой.
+        connections.close_all()
+
+
+def run_pending(workers=1, limit=None, names=None, worker=None):
+    """Выполняет готовые задачи пулом потоков; возвращает их число."""
+    worker = worker or worker_name()
+    job_ids = due_jobs(limit or workers * 10, names)
+    if workers <= 1:
+        results = [claim_and_run(job_id, worker) for job_id in job_ids]
+    else:
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='jobs'
+        ) as executor:
+            results = list(executor.map(
+                _run_in_thread, job_ids, [worker] * len(job_ids)
+            ))
+    return sum(result is not None for result in results)
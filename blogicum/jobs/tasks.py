@@ -0,0 +1,7 @@
+from .mail import deserialize_message, get_delivery_connection
+from .queue import task
+
+
+@task('jobs.send_email')
+def send_email(**message):
+    deserialize_message(message, connection=get_delivery_connection()).send()
@@ -1,13 +1,14 @@
 from django.urls import path
-from django.views.generic.base import TemplateView
+
+from .views import StaticPageView
 
 app_name = 'pages'
 
 urlpatterns = [
     path('about/',
-         TemplateView.as_view(template_name="pages/about.html"),
+         StaticPageView.as_view(template_name="pages/about.html"),
          name='about'),
     path('rules/',
-         TemplateView.as_view(template_name="pages/rules.html"),
+         StaticPageView.as_view(template_name="pages/rules.html"),
          name='rules')
 ]
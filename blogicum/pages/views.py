@@ -1,4 +1,9 @@
 from django.shortcuts import render
+from django.views.generic.base import TemplateView
+
+
+class StaticPageView(TemplateView):
+    read_replica = True
 
 
 def page_not_found(request, exception):
@@ -0,0 +1,197 @@
+"""Конкурентная нагрузка чтения и записи на представления блога.
+
+Читатели открывают ленты и страницы публикаций, писатели добавляют
+комментарии; каждый поток работает со своим соединением к файловой базе
+SQLite. Запуск из корня репозитория:
+
+    pytest tests/benchmarks/bench_concurrency.py -s
+    BLOG_BENCH_PRAGMAS=0 pytest tests/benchmarks/bench_concurrency.py -s
+
+Переменные окружения:
+    BLOG_BENCH_PRAGMAS — 0, чтобы вместо settings.SQLITE_PRAGMAS
+        использовать умолчания SQLite (журнал отката, synchronous=FULL,
+        без ожидания блокировки);
+    BLOG_BENCH_WRITE_QUEUE — 1, чтобы писать через очередь записи
+        (settings.WRITE_QUEUE_ENABLED);
+    BLOG_BENCH_POSTS — число публикаций (по умолчанию 5000);
+    BLOG_BENCH_READERS, BLOG_BENCH_WRITERS — число потоков (8 и 4);
+    BLOG_BENCH_DURATION — длительность нагрузки в секундах (10);
+    BLOG_BENCH_OUTPUT — файл с результатами
+        (bench_concurrency_results.json).
+"""
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.client import Client
+from django.urls import reverse
+
+from blog.models import Category, Post
+
+PRAGMAS = os.environ.get("BLOG_BENCH_PRAGMAS") != "0"
+WRITE_QUEUE = os.environ.get("BLOG_BENCH_WRITE_QUEUE") == "1"
+POSTS = int(os.environ.get("BLOG_BENCH_POSTS", 5000))
+READERS = int(os.environ.get("BLOG_BENCH_READERS", 8))
+WRITERS = int(os.environ.get("BLOG_BENCH_WRITERS", 4))
+DURATION = float(os.environ.get("BLOG_BENCH_DURATION", 10))
+OUTPUT = os.environ.get(
+    "BLOG_BENCH_OUTPUT", "bench_concurrency_results.json"
+)
+
+BASELINE_PRAGMAS = {
+    "journal_mode": "delete",
+    "synchronous": "full",
+    "busy_timeout": 0,
+}
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(tmp_path_factory):
+    # В памяти SQLite потоки делят одно соединение и не конкурируют
+    # за блокировки файла: нагрузка нужна на настоящей базе.
+    db_settings = settings.DATABASES["default"]
+    db_settings.setdefault("TEST", {})["NAME"] = str(
+        tmp_path_factory.mktemp("bench") / "bench.sqlite3"
+    )
+    if not PRAGMAS:
+        db_settings["PRAGMAS"] = {
+            **settings.SQLITE_PRAGMAS, **BASELINE_PRAGMAS
+        }
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+class Worker(threading.Thread):
+    def __init__(self, role, client, urls, post_ids, deadline, seed):
+        super().__init__()
+        self.role = role
+        self.client = client
+        self.urls = urls
+        self.post_ids = post_ids
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.timings = []
+        self.errors = 0
+        self.locked = 0
+
+    def request(self):
+        if self.role == "writer":
+            post_id = self.rng.choice(self.post_ids)
+            return self.client.post(
+                reverse("blog:add_comment", args=[post_id]),
+                {"text": f"Комментарий {self.rng.random()}"},
+            )
+        return self.client.get(self.rng.choice(self.urls))
+
+    def run(self):
+        try:
+            while time.monotonic() < self.deadline:
+                start = time.perf_counter()
+                try:
+                    response = self.request()
+                except OperationalError as error:
+                    self.errors += 1
+                    self.locked += "locked" in str(error)
+                    continue
+                if response.status_code >= 400:
+                    self.errors += 1
+                    continue
+                self.timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            connection.close()
+
+
+def _summary(workers):
+    timings = [value for worker in workers for value in worker.timings]
+    return {
+        "threads": len(workers),
+        "requests": len(timings),
+        "rps": round(len(timings) / DURATION, 1),
+        "p50_ms": round(_percentile(timings, 50), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "errors": sum(worker.errors for worker in workers),
+        "locked": sum(worker.locked for worker in workers),
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reads_and_writes(settings, tmp_path):
+    settings.WRITE_QUEUE_ENABLED = WRITE_QUEUE
+    settings.WRITE_QUEUE_LOCK_FILE = tmp_path / "write.lock"
+    call_command(
+        "generate_blog_data", posts=POSTS, comments=POSTS * 3,
+        users=max(READERS + WRITERS, 10), verbosity=0,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+    post_ids = list(
+        Post.published_posts.values_list("pk", flat=True)[:500]
+    )
+    urls = [reverse("blog:index")] + [
+        reverse("blog:category_posts", args=[slug])
+        for slug in Category.objects.filter(
+            is_published=True
+        ).values_list("slug", flat=True)
+    ] + [reverse("blog:post_detail", args=[pk]) for pk in post_ids]
+    authors = list(get_user_model().objects.all()[:WRITERS])
+    cache.clear()
+
+    deadline = time.monotonic() + DURATION
+    workers = []
+    for number in range(READERS):
+        workers.append(
+            Worker("reader", Client(), urls, post_ids, deadline, number)
+        )
+    for number, author in enumerate(authors):
+        client = Client()
+        client.force_login(author)
+        workers.append(Worker(
+            "writer", client, urls, post_ids, deadline, READERS + number
+        ))
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    results = {
+        role: _summary([w for w in workers if w.role == role])
+        for role in ("reader", "writer")
+    }
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "journal_mode": journal_mode,
+            "pragmas": connection.settings_dict.get(
+                "PRAGMAS", settings.SQLITE_PRAGMAS
+            ),
+            "write_queue": WRITE_QUEUE,
+            "duration": DURATION,
+            "posts": POSTS,
+        },
+        "roles": results,
+    }
+    with open(OUTPUT, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+
+    print(f"\njournal_mode={journal_mode} write_queue={WRITE_QUEUE}")
+    for role, row in results.items():
+        print(
+            f"{role:<7} {row['threads']:>3} потоков  {row['rps']:>8} rps"
+            f"  p50 {row['p50_ms']:>9.2f} ms  p95 {row['p95_ms']:>9.2f} ms"
+            f"  ошибок {row['errors']} (locked {row['locked']})"
+        )
@@ -0,0 +1,158 @@
+"""Бенчмарк всех маршрутов blog/urls.py и pages/urls.py.
+
+Файл не попадает в обычный прогон тестов (python_files = test_*.py),
+запускается явно из корня репозитория:
+
+    BLOG_BENCH_POSTS=100000 pytest tests/benchmarks/bench_views.py -s
+
+Переменные окружения:
+    BLOG_BENCH_POSTS — число публикаций (по умолчанию 10000);
+    BLOG_BENCH_COMMENTS — среднее число комментариев к публикации (3);
+    BLOG_BENCH_REPEAT — число запросов к каждому маршруту (30);
+    BLOG_BENCH_COLD — 1, чтобы очищать кэш перед каждым запросом;
+    BLOG_BENCH_OUTPUT — файл с результатами (bench_results.json).
+
+Результаты двух прогонов сравнивает tests/benchmarks/compare.py.
+"""
+import json
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.urls import URLPattern, reverse
+
+from blog import urls as blog_urls
+from blog.models import Comment, Post
+from pages import urls as pages_urls
+from seed import seed_dataset
+
+POSTS = int(os.environ.get("BLOG_BENCH_POSTS", 10000))
+COMMENTS_PER_POST = int(os.environ.get("BLOG_BENCH_COMMENTS", 3))
+REPEAT = int(os.environ.get("BLOG_BENCH_REPEAT", 30))
+COLD = os.environ.get("BLOG_BENCH_COLD") == "1"
+OUTPUT = os.environ.get("BLOG_BENCH_OUTPUT", "bench_results.json")
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _routes():
+    for module in (blog_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                yield (
+                    f"{module.app_name}:{pattern.name}",
+                    tuple(pattern.pattern.converters),
+                )
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += time.perf_counter() - start
+
+
+def _measure(client, url):
+    timings, query_counts, query_times = [], [], []
+    if not COLD:
+        client.get(url)
+    status = None
+    for _ in range(REPEAT):
+        if COLD:
+            cache.clear()
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        status = response.status_code
+        query_counts.append(timer.count)
+        query_times.append(timer.elapsed * 1000)
+    return {
+        "url": url,
+        "status": status,
+        "p50_ms": round(_percentile(timings, 50), 3),
+        "p95_ms": round(_percentile(timings, 95), 3),
+        "queries": round(statistics.mean(query_counts), 2),
+        "query_ms": round(statistics.mean(query_times), 3),
+    }
+
+
+@pytest.fixture
+def dataset(mixer):
+    return seed_dataset(mixer, POSTS, comments_per_post=COMMENTS_PER_POST)
+
+
+@pytest.mark.django_db
+def test_benchmark_routes(mixer, dataset):
+    # Самая обсуждаемая публикация — худший случай для страницы поста.
+    post = Post.published_posts.select_related(
+        "author", "category"
+    ).order_by("-comment_count").first()
+    comment = mixer.blend(Comment, post=post, author=post.author)
+    url_kwargs = {
+        "post_id": post.pk,
+        "comment_id": comment.pk,
+        "username": post.author.username,
+        "category_slug": post.category.slug,
+    }
+    author_client = Client()
+    author_client.force_login(post.author)
+    clients = {"anonymous": Client(), "author": author_client}
+
+    results = {}
+    for route, converters in _routes():
+        url = reverse(
+            route, kwargs={name: url_kwargs[name] for name in converters}
+        )
+        for client_name, client in clients.items():
+            results[f"{route} [{client_name}]"] = _measure(client, url)
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "repeat": REPEAT,
+            "cold_cache": COLD,
+            "dataset": dataset,
+        },
+        "routes": results,
+    }
+    with open(OUTPUT, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+
+    width = max(map(len, results))
+    print()
+    for name, row in results.items():
+        print(
+            f"{name:<{width}}  {row['status']}  p50 {row['p50_ms']:>9.2f} ms"
+            f"  p95 {row['p95_ms']:>9.2f} ms  {row['queries']:>6} q"
+            f"  {row['query_ms']:>8.2f} ms in db"
+        )
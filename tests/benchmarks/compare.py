@@ -0,0 +1,61 @@
+"""Сравнивает два файла результатов bench_views.py.
+
+    python tests/benchmarks/compare.py base.json new.json --threshold 10
+
+Код возврата 1, если p95 какого-либо маршрута вырос больше чем на
+threshold процентов или выросло число запросов.
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _delta(old, new):
+    if not old:
+        return 0.0
+    return (new - old) / old * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0,
+        help="Допустимый рост p95 в процентах.",
+    )
+    args = parser.parse_args(argv)
+    base, new = _load(args.base), _load(args.new)
+    print(
+        f"{base['meta'].get('revision')} -> {new['meta'].get('revision')}"
+    )
+    regressions = []
+    width = max(map(len, new["routes"]))
+    for route, row in new["routes"].items():
+        old = base["routes"].get(route)
+        if old is None:
+            print(f"{route:<{width}}  новый маршрут")
+            continue
+        p95_delta = _delta(old["p95_ms"], row["p95_ms"])
+        queries_delta = row["queries"] - old["queries"]
+        mark = ""
+        if p95_delta > args.threshold or queries_delta > 0:
+            mark = "  <-- хуже"
+            regressions.append(route)
+        elif p95_delta < -args.threshold:
+            mark = "  лучше"
+        print(
+            f"{route:<{width}}  p95 {old['p95_ms']:>9.2f} -> "
+            f"{row['p95_ms']:>9.2f} ms ({p95_delta:+6.1f}%)  "
+            f"запросов {old['queries']} -> {row['queries']}{mark}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+# Сколько уникальных текстов генерирует mixer: дальше они переиспользуются,
+# иначе посев миллиона публикаций упирается в генерацию случайного текста.
+SAMPLE_SIZE = 500
+
+
+def _bulk_create(model, objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+
+
+def seed_dataset(mixer, posts, comments_per_post=3, users=50, categories=20,
+                 locations=20, seed=0, batch_size=5000):
+    """Наполняет базу публикациями и комментариями для бенчмарков.
+
+    Пользователи, категории и местоположения создаются через mixer как
+    в обычных фикстурах, а публикации и комментарии — пакетным
+    bulk_create по образцам mixer. bulk_create не вызывает сигналы,
+    поэтому is_visible и comment_count заполняются здесь же.
+    """
+    rng = random.Random(seed)
+    authors = mixer.cycle(users).blend(get_user_model())
+    category_list = mixer.cycle(categories).blend(
+        Category, is_published=True
+    )
+    location_list = mixer.cycle(locations).blend(
+        Location, is_published=True
+    )
+    with mixer.ctx(commit=False):
+        post_samples = mixer.cycle(min(posts, SAMPLE_SIZE)).blend(
+            Post, author=authors[0], category=category_list[0]
+        )
+        comment_samples = mixer.cycle(SAMPLE_SIZE).blend(
+            Comment, author=authors[0], post=post_samples[0]
+        )
+
+    now = timezone.now()
+    post_comments = [
+        int(rng.expovariate(1 / comments_per_post))
+        if comments_per_post else 0
+        for _ in range(posts)
+    ]
+
+    def make_posts():
+        for i, comment_count in enumerate(post_comments):
+            sample = post_samples[i % len(post_samples)]
+            yield Post(
+                title=sample.title,
+                text=sample.text,
+                pub_date=now - timedelta(minutes=rng.randint(1, 10 ** 6)),
+                author=rng.choice(authors),
+                category=rng.choice(category_list),
+                location=rng.choice(location_list),
+                is_published=True,
+                is_visible=True,
+                comment_count=comment_count,
+            )
+
+    _bulk_create(Post, make_posts(), batch_size)
+
+    def make_comments():
+        post_rows = Post.objects.filter(
+            comment_count__gt=0
+        ).values_list('pk', 'comment_count').iterator()
+        for post_id, comment_count in post_rows:
+            for _ in range(comment_count):
+                sample = rng.choice(comment_samples)
+                yield Comment(
+                    text=sample.text,
+                    post_id=post_id,
+                    author=rng.choice(authors),
+                )
+
+    _bulk_create(Comment, make_comments(), batch_size)
+    cache.clear()
+    return {
+        'users': users,
+        'categories': categories,
+        'locations': locations,
+        'posts': posts,
+        'comments': sum(post_comments),
+    }
@@ -0,0 +1,32 @@
+from typing import Callable
+
+import pytest
+from django.http import HttpResponse
+from django.test import Client
+
+from blog import scheduler
+from blog.query_budget import count_queries, get_query_budget
+
+
+@pytest.fixture
+def assert_query_budget() -> Callable[[Client, str], HttpResponse]:
+    """Проверяет, что запрос укладывается в бюджет `query_budget` своего
+    view. Кэши карточек и страниц не прогреваются, поэтому N+1 в шаблонах
+    тоже попадает в счёт."""
+
+    def _assert_query_budget(client: Client, url: str) -> HttpResponse:
+        scheduler.run_pending()
+        with count_queries() as queries:
+            response = client.get(url)
+        budget = get_query_budget(response.resolver_match.func)
+        assert budget is not None, (
+            f"Задайте атрибут `query_budget` у представления для `{url}`."
+        )
+        executed = "\n".join(queries.queries)
+        assert queries.count <= budget, (
+            f"Страница `{url}` выполняет {queries.count} SQL-запросов при"
+            f" бюджете {budget}:\n{executed}"
+        )
+        return response
+
+    return _assert_query_budget
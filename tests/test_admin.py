@@ -0,0 +1,214 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+POST_CHANGELIST = "/admin/blog/post/"
+
+
+def _changelist(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что список `{url}` в админке открывается без ошибок."
+    )
+    return response, [query["sql"] for query in ctx.captured_queries]
+
+
+def test_post_changelist_scales(
+        admin_client, mixer, user, another_user, published_category,
+        published_location
+):
+    posts = mixer.cycle(30).blend(
+        "blog.Post", author=mixer.sequence(user, another_user),
+        category=published_category, location=published_location,
+        text="слово " * 100,
+    )
+    response, queries = _changelist(admin_client, POST_CHANGELIST)
+    changelist = response.context["cl"]
+    assert changelist.result_count == len(posts)
+    assert len(queries) < 15, (
+        "Убедитесь, что связанные объекты списка публикаций загружаются"
+        " без запроса на каждую строку:\n" + "\n".join(queries)
+    )
+    content = response.content.decode("utf-8")
+    assert 'name="author"' in content and another_user.username not in (
+        content.split('id="changelist-filter"', 1)[-1]
+    ), (
+        "Убедитесь, что фильтр по автору — поле ввода, а не перечень всех"
+        " пользователей."
+    )
+    assert "слово слово" in content
+    assert ("слово " * 20) not in content, (
+        "Убедитесь, что в списке выводится только начало текста публикации."
+    )
+
+    _, queries = _changelist(admin_client, POST_CHANGELIST)
+    assert not any(sql.startswith("SELECT COUNT(*)") for sql in queries), (
+        "Убедитесь, что число публикаций в списке берётся из кэша."
+    )
+
+    response, _ = _changelist(
+        admin_client, POST_CHANGELIST, {"author": another_user.username}
+    )
+    assert {post.author_id for post in response.context["cl"].result_list} \
+        == {another_user.id}
+
+
+def test_post_changelist_estimated_count(
+        admin_client, monkeypatch, settings, mixer, user, published_category
+):
+    from blog.admin import PostAdmin
+
+    settings.ADMIN_COUNT_LIMIT = 15
+    monkeypatch.setattr(PostAdmin, "list_per_page", 10)
+    mixer.cycle(30).blend(
+        "blog.Post", author=user, category=published_category
+    )
+    for page, has_next in ((1, True), (3, False)):
+        response, _ = _changelist(
+            admin_client, POST_CHANGELIST, {"p": page}
+        )
+        changelist = response.context["cl"]
+        assert changelist.paginator.is_estimated, (
+            "Убедитесь, что при числе записей больше ADMIN_COUNT_LIMIT"
+            " список в админке не считает их точно."
+        )
+        assert len(changelist.result_list) == 10
+        assert changelist.paginator.page(page).has_next() == has_next
+
+
+def test_post_changelist_search_uses_fts(
+        admin_client, mixer, user, published_category
+):
+    found = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Редкое слово",
+    )
+    mixer.cycle(3).blend("blog.Post", author=user,
+                         category=published_category, title="Обычное")
+    response, queries = _changelist(
+        admin_client, POST_CHANGELIST, {"q": "редк"}
+    )
+    assert list(response.context["cl"].result_list) == [found]
+    assert any("MATCH" in sql for sql in queries), (
+        "Убедитесь, что поиск в админке идёт по полнотекстовому индексу."
+    )
+    assert not any("LIKE" in sql for sql in queries)
+
+
+def test_post_changelist_search_without_words(
+        admin_client, mixer, user, published_category
+):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    response, _ = _changelist(admin_client, POST_CHANGELIST, {"q": "***"})
+    assert response.context["cl"].result_count == 0, (
+        "Убедитесь, что поиск без слов в админке возвращает пустой список."
+    )
+
+
+def test_comment_changelist_search(
+        admin_client, mixer, user, another_user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Заметки натуралиста",
+    )
+    by_text = mixer.blend(
+        "blog.Comment", author=user, text="Замечательный барсук"
+    )
+    by_title = mixer.blend(
+        "blog.Comment", author=user, post=post, text="Спасибо"
+    )
+    by_author = mixer.blend(
+        "blog.Comment", author=another_user, text="Согласен"
+    )
+    expected = {
+        "барсук": {by_text},
+        "натуралист": {by_title},
+        another_user.username: {by_author},
+    }
+    for query, comments in expected.items():
+        response, queries = _changelist(
+            admin_client, "/admin/blog/comment/", {"q": query}
+        )
+        assert set(response.context["cl"].result_list) == comments, (
+            "Убедитесь, что комментарии ищутся по имени автора, заголовку"
+            " публикации и тексту."
+        )
+        assert not any("LIKE" in sql for sql in queries), (
+            "Убедитесь, что поиск комментариев не использует LIKE."
+        )
+
+    response, _ = _changelist(
+        admin_client, "/admin/blog/comment/", {"post": post.id}
+    )
+    assert list(response.context["cl"].result_list) == [by_title]
+
+
+def test_comment_post_autocomplete_without_words(
+        admin_client, mixer, user, published_category
+):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    response = admin_client.get("/admin/autocomplete/", {
+        "app_label": "blog", "model_name": "comment",
+        "field_name": "post", "term": "***",
+    })
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что выбор публикации в форме комментария не падает"
+        " на вводе без слов."
+    )
+    assert response.json()["results"] == []
+
+
+def test_comment_changelist_count_follows_changes(
+        admin_client, mixer, user, post_with_published_location
+):
+    url = "/admin/blog/comment/"
+    comments = mixer.cycle(2).blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+    response, _ = _changelist(admin_client, url)
+    assert response.context["cl"].result_count == 2
+
+    mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+    response, _ = _changelist(admin_client, url)
+    assert response.context["cl"].result_count == 3, (
+        "Убедитесь, что после добавления комментария список в админке"
+        " показывает новое число записей."
+    )
+
+    comments[0].delete()
+    response, _ = _changelist(admin_client, url)
+    assert response.context["cl"].result_count == 2, (
+        "Убедитесь, что после удаления комментария список в админке"
+        " показывает новое число записей."
+    )
+
+
+def test_comment_changelist_estimated_count(
+        admin_client, monkeypatch, settings, mixer, user,
+        post_with_published_location
+):
+    from blog.admin import CommentAdmin
+
+    settings.ADMIN_COUNT_LIMIT = 15
+    monkeypatch.setattr(CommentAdmin, "list_per_page", 10)
+    mixer.cycle(30).blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+    for page in (1, 3):
+        response, _ = _changelist(
+            admin_client, "/admin/blog/comment/", {"p": page}
+        )
+        changelist = response.context["cl"]
+        assert changelist.paginator.is_estimated, (
+            "Убедитесь, что список комментариев при числе записей больше"
+            " ADMIN_COUNT_LIMIT открывается без точного подсчёта."
+        )
+        assert len(changelist.result_list) == 10
@@ -0,0 +1,140 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_cache_invalidation(
+        client, mixer, user, post_with_published_location, published_category
+):
+    post = post_with_published_location
+    assert post.title in client.get("/").content.decode("utf-8")
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "Обновлённый заголовок" in content, (
+        "Убедитесь, что карточка публикации обновляется после её изменения."
+    )
+
+    published_category.title = "Переименованная категория"
+    published_category.save()
+    content = client.get("/").content.decode("utf-8")
+    assert "Переименованная категория" in content, (
+        "Убедитесь, что карточка публикации обновляется после изменения"
+        " категории."
+    )
+
+    mixer.blend("blog.Comment", post=post, author=user)
+    content = client.get("/").content.decode("utf-8")
+    assert "Комментарии (1)" in content, (
+        "Убедитесь, что карточка публикации обновляется после добавления"
+        " комментария."
+    )
+
+
+def test_anonymous_page_cache(
+        client, user_client, django_assert_num_queries,
+        post_with_published_location
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        client.get(url)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert post.title in response.content.decode("utf-8"), (
+            "Убедитесь, что страница из кэша совпадает с исходной."
+        )
+
+    post.title = "Заголовок после правки"
+    post.save()
+    for url in urls:
+        assert "Заголовок после правки" in client.get(url).content.decode(
+            "utf-8"
+        ), (
+            "Убедитесь, что кэш страниц сбрасывается при изменении"
+            " публикации."
+        )
+
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as ctx:
+        user_client.get("/")
+    assert ctx.captured_queries, (
+        "Убедитесь, что страницы для авторизованных пользователей не"
+        " берутся из кэша."
+    )
+
+
+def test_recount_comments_invalidates_pages(
+        client, mixer, user, post_with_published_location
+):
+    from django.core.management import call_command
+
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=7)
+    assert "Комментарии (7)" in client.get("/").content.decode("utf-8")
+    call_command("recount_comments")
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что после `recount_comments` страницы из кэша"
+        " показывают исправленный счётчик комментариев."
+    )
+
+
+def test_category_page_uses_category_cache(
+        user_client, post_with_published_location, published_category
+):
+    url = f"/category/{published_category.slug}/"
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get(url)
+    assert response.context["category"] == published_category
+    category_queries = [
+        query["sql"] for query in ctx.captured_queries
+        if 'FROM "blog_category"' in query["sql"]
+    ]
+    assert not category_queries, (
+        "Убедитесь, что на прогретом кэше страница категории не обращается к"
+        " таблице категорий."
+    )
+
+    published_category.is_published = False
+    published_category.save()
+    assert user_client.get(url).status_code == 404, (
+        "Убедитесь, что кэш категорий сбрасывается при изменении категории."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_caches_invalidated_after_commit(
+        client, rf, post_with_published_location
+):
+    from django.core.cache import cache
+    from django.db import transaction
+    from django.http import HttpResponse
+
+    from blog.caching import get_versions, page_cache_key, version_key
+
+    post = post_with_published_location
+    client.get("/")
+    with transaction.atomic():
+        post.title = "Заголовок после COMMIT"
+        post.save()
+        # Так кэш заполнил бы запрос из другого соединения, прочитавший
+        # строки до COMMIT.
+        cache.set(page_cache_key(rf.get("/")), HttpResponse("Старая лента"))
+        version = get_versions(version_key("post", post.pk))
+    assert get_versions(version_key("post", post.pk)) != version, (
+        "Убедитесь, что версии кэша сбрасываются и после COMMIT."
+    )
+    content = client.get("/").content.decode("utf-8")
+    assert "Старая лента" not in content and post.title in content, (
+        "Убедитесь, что страница, закэшированная до COMMIT записи, не"
+        " отдаётся после него."
+    )
@@ -298,3 +298,35 @@ def test_404_on_comment_deleted_post(
         ),
         assert_created=False,
     )
+
+
+@pytest.mark.django_db
+def test_comment_count_is_maintained(
+        mixer, user, post_with_published_location
+):
+    from django.core.management import call_command
+    from django.core.management.base import CommandError
+
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(
+        "blog.Comment", post=post, author=user
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что счётчик комментариев публикации увеличивается при"
+        " добавлении комментария."
+    )
+
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что счётчик комментариев публикации уменьшается при"
+        " удалении комментария."
+    )
+
+    type(post).objects.filter(pk=post.pk).update(comment_count=10)
+    with pytest.raises(CommandError):
+        call_command("recount_comments", "--check", "--batch-size=1")
+    call_command("recount_comments", "--batch-size=1")
+    post.refresh_from_db()
+    assert post.comment_count == 2
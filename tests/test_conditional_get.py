@@ -0,0 +1,209 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _get(client, url, **headers):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, **headers)
+    return response, ctx.captured_queries
+
+
+@pytest.mark.parametrize("client_fixture", ["client", "user_client"])
+def test_post_detail_not_modified(request, client_fixture, comment_to_a_post):
+    client = request.getfixturevalue(client_fixture)
+    url = f"/posts/{comment_to_a_post.post_id}/"
+    # Первый ответ выдаёт CSRF-cookie, от которой зависит ETag.
+    client.get(url)
+    response, queries = _get(client, url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), (
+        "Убедитесь, что страница публикации отдаёт заголовки `ETag` и"
+        " `Last-Modified`."
+    )
+
+    repeated, not_modified_queries = _get(
+        client, url, HTTP_IF_NONE_MATCH=response["ETag"]
+    )
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что повторный запрос с актуальным `ETag` получает 304."
+    )
+    assert len(not_modified_queries) < len(queries), (
+        "Убедитесь, что при ответе 304 шаблон не рендерится и комментарии"
+        " не загружаются."
+    )
+
+    repeated, _ = _get(
+        client, url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_post_detail_etag_changes_on_comment(
+        user_client, mixer, user, comment_to_a_post
+):
+    url = f"/posts/{comment_to_a_post.post_id}/"
+    user_client.get(url)
+    etag = user_client.get(url)["ETag"]
+    mixer.blend("blog.Comment", post=comment_to_a_post.post, author=user)
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после нового комментария страница публикации"
+        " отдаётся заново."
+    )
+    assert response["ETag"] != etag
+
+    comment_to_a_post.text = "Исправленный текст"
+    comment_to_a_post.save()
+    etag = response["ETag"]
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после правки комментария страница публикации"
+        " отдаётся заново."
+    )
+
+
+def test_post_detail_single_query_permissions(
+        client, user_client, another_user_client,
+        unpublished_posts_with_published_locations
+):
+    url = f"/posts/{unpublished_posts_with_published_locations[0].id}/"
+    for anonymous_or_stranger in (client, another_user_client):
+        assert (
+            anonymous_or_stranger.get(url).status_code
+            == HTTPStatus.NOT_FOUND
+        )
+    response, queries = _get(user_client, url)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что автор видит свою снятую с публикации запись."
+    )
+    post_queries = [
+        query for query in queries if 'FROM "blog_post"' in query["sql"]
+    ]
+    assert len(post_queries) == 1, (
+        "Убедитесь, что права на просмотр публикации проверяются одним"
+        " запросом."
+    )
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+def _etags(client, urls):
+    return {url: client.get(url)["ETag"] for url in urls}
+
+
+def _not_modified(client, etags):
+    return {
+        url for url, etag in etags.items()
+        if client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+        == HTTPStatus.NOT_MODIFIED
+    }
+
+
+@pytest.mark.parametrize("client_fixture", ["client", "user_client"])
+def test_feeds_not_modified(
+        request, client_fixture, feed_urls, comment_to_a_post
+):
+    client = request.getfixturevalue(client_fixture)
+    etags = _etags(client, feed_urls)
+    for url, etag in etags.items():
+        response, queries = _get(client, url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f"Убедитесь, что неизменившаяся лента `{url}` отдаёт 304."
+        )
+        assert not [
+            query for query in queries if '"blog_post"' in query["sql"]
+        ], (
+            f"Убедитесь, что при ответе 304 лента `{url}` не выполняет"
+            " запросов к публикациям."
+        )
+
+
+def test_feed_validators_follow_changes(
+        client, mixer, user, another_user, feed_urls, published_category,
+        another_category, comment_to_a_post
+):
+    etags = _etags(client, feed_urls)
+    mixer.blend(
+        "blog.Post", author=another_user, category=another_category
+    )
+    assert _not_modified(client, etags) == set(feed_urls[1:]), (
+        "Убедитесь, что новая публикация меняет валидаторы только своих"
+        " лент."
+    )
+
+    etags = _etags(client, feed_urls)
+    mixer.blend("blog.Comment", post=comment_to_a_post.post, author=user)
+    assert not _not_modified(client, etags), (
+        "Убедитесь, что новый комментарий меняет валидаторы лент, где"
+        " показана его публикация."
+    )
+
+    etags = _etags(client, feed_urls)
+    published_category.title = "Новое название"
+    published_category.save()
+    assert not _not_modified(client, etags), (
+        "Убедитесь, что изменение категории меняет валидаторы лент."
+    )
+
+
+@pytest.mark.parametrize("url", ["/", "/rss/"])
+def test_feed_changes_within_one_second(
+        monkeypatch, client, mixer, url, post_with_published_location
+):
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    response = client.get(url)
+    mixer.blend(
+        "blog.Post",
+        author=post_with_published_location.author,
+        category=post_with_published_location.category,
+    )
+    repeated = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert repeated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что изменение ленты в ту же секунду сдвигает"
+        " `Last-Modified` и клиент с `If-Modified-Since` получает новую"
+        " ленту."
+    )
+    assert repeated["Last-Modified"] != response["Last-Modified"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("url", ["/", "/rss/"])
+def test_feed_validators_move_after_commit(
+        client, mixer, url, post_with_published_location
+):
+    from django.db import transaction
+
+    with transaction.atomic():
+        mixer.blend(
+            "blog.Post",
+            author=post_with_published_location.author,
+            category=post_with_published_location.category,
+        )
+        # Ответ, собранный до COMMIT, мог прочитать старые строки.
+        response = client.get(url)
+    for headers in (
+        {"HTTP_IF_NONE_MATCH": response["ETag"]},
+        {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+    ):
+        assert client.get(url, **headers).status_code == HTTPStatus.OK, (
+            "Убедитесь, что отметка изменения ленты сдвигается и после"
+            " COMMIT записи."
+        )
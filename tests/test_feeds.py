@@ -0,0 +1,130 @@
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _get(client, url, **headers):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, **headers)
+    return response, ctx.captured_queries
+
+
+def _rss_titles(response):
+    root = ElementTree.fromstring(response.content)
+    return [item.findtext("title") for item in root.iter("item")]
+
+
+def test_index_feed_visibility_and_limit(
+        settings, client, many_posts_with_published_locations,
+        post_with_published_location, future_posts,
+        posts_with_unpublished_category,
+        unpublished_posts_with_published_locations
+):
+    from blog.models import Post
+
+    settings.SYNDICATION_ITEMS = 5
+    response = client.get("/rss/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("application/rss+xml")
+    expected = list(
+        Post.published_posts.order_by("-pub_date", "-id").values_list(
+            "title", flat=True
+        )[:5]
+    )
+    assert _rss_titles(response) == expected, (
+        "Убедитесь, что RSS-лента главной содержит последние"
+        " `SYNDICATION_ITEMS` публикаций, видимых в ленте."
+    )
+    hidden = {
+        post.title for post in [
+            *future_posts,
+            *posts_with_unpublished_category,
+            *unpublished_posts_with_published_locations,
+        ]
+    }
+    assert not hidden & set(_rss_titles(client.get("/rss/"))), (
+        "Убедитесь, что в RSS-ленту не попадают скрытые публикации."
+    )
+
+
+def test_category_and_author_feeds(
+        client, user, post_with_published_location, post_with_another_category,
+        post_of_another_author
+):
+    category = post_with_published_location.category
+    response = client.get(f"/category/{category.slug}/atom/")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("application/atom+xml")
+    root = ElementTree.fromstring(response.content)
+    titles = {
+        entry.findtext(f"{ATOM}title") for entry in root.iter(f"{ATOM}entry")
+    }
+    assert titles == {
+        post_with_published_location.title, post_of_another_author.title
+    }, "Убедитесь, что лента категории содержит только её публикации."
+
+    response = client.get(f"/profile/{user.username}/rss/")
+    assert set(_rss_titles(response)) == {
+        post_with_published_location.title, post_with_another_category.title
+    }, "Убедитесь, что лента автора содержит только его публикации."
+
+    for url in ("/category/no-such-category/rss/", "/profile/nobody/rss/"):
+        assert client.get(url).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_feed_cached_and_not_modified(client, post_with_published_location):
+    url = "/rss/"
+    response, queries = _get(client, url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что лента отдаёт заголовки `ETag` и `Last-Modified`."
+
+    repeated, cached_queries = _get(client, url)
+    assert repeated.content == response.content
+    assert not cached_queries, (
+        "Убедитесь, что повторный запрос ленты отдаётся из кэша без"
+        " запросов к базе."
+    )
+
+    for headers in (
+        {"HTTP_IF_NONE_MATCH": response["ETag"]},
+        {"HTTP_IF_MODIFIED_SINCE": response["Last-Modified"]},
+    ):
+        repeated, not_modified_queries = _get(client, url, **headers)
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED, (
+            "Убедитесь, что повторный запрос ленты с актуальными"
+            " валидаторами получает 304."
+        )
+        assert not not_modified_queries
+
+
+def test_feed_invalidated_on_post_change(
+        mixer, client, user, post_with_published_location
+):
+    url = f"/profile/{user.username}/rss/"
+    etag = client.get(url)["ETag"]
+    new_post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=post_with_published_location.category,
+        location=post_with_published_location.location,
+    )
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после новой публикации лента автора отдаётся заново."
+    )
+    assert new_post.title in _rss_titles(response)
+
+    post_with_published_location.is_published = False
+    post_with_published_location.save()
+    assert post_with_published_location.title not in _rss_titles(
+        client.get(url)
+    ), "Убедитесь, что снятая с публикации запись пропадает из ленты."
@@ -0,0 +1,58 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _generate(**options):
+    call_command(
+        "generate_blog_data", users=5, categories=4, locations=3, posts=300,
+        comments=1500, future_share=0.1, **options
+    )
+
+
+def _dataset():
+    return (
+        list(Post.objects.order_by("pk").values_list(
+            "title", "category__slug", "author__username", "is_published",
+            "comment_count",
+        )),
+        list(Comment.objects.order_by("pk").values_list(
+            "text", "post__title", "author__username",
+        )),
+    )
+
+
+def test_generated_data_is_consistent():
+    _generate()
+    now = timezone.now()
+    assert Post.objects.count() == 300
+    assert Comment.objects.count() == 1500
+    future = Post.objects.filter(pub_date__gt=now)
+    assert future.exists() and not future.filter(is_visible=True).exists(), (
+        "Убедитесь, что генератор создаёт отложенные публикации, скрытые"
+        " до наступления времени публикации."
+    )
+    assert not Comment.objects.filter(post__pub_date__gt=now).exists()
+    call_command("recount_comments", check=True)
+
+    counts = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True
+    )
+    assert sum(counts[:30]) > sum(counts) / 2, (
+        "Убедитесь, что комментарии смещены к популярным публикациям."
+    )
+
+
+def test_generated_data_is_deterministic():
+    _generate(seed=7)
+    first = _dataset()
+    Post.objects.all().delete()
+    _generate(seed=7)
+    assert _dataset() == first, (
+        "Убедитесь, что при одинаковом `--seed` генерируются одинаковые"
+        " данные."
+    )
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@queue.task("tests.record")
+def record(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise RuntimeError("сбой обработчика")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_jobs_run_by_priority():
+    queue.enqueue("tests.record", {"value": "low"},
+                  priority=Job.PRIORITY_LOW)
+    queue.enqueue("tests.record", {"value": "normal"})
+    queue.enqueue("tests.record", {"value": "high"},
+                  priority=Job.PRIORITY_HIGH)
+    queue.enqueue("tests.record", {"value": "later"},
+                  run_at=timezone.now() + timedelta(hours=1))
+    assert not calls, "Убедитесь, что задачи не выполняются при постановке."
+
+    call_command("run_jobs", "--once", "--workers=1")
+    assert calls == ["high", "normal", "low"], (
+        "Убедитесь, что задачи выполняются по приоритету, а отложенные ждут"
+        " своего времени."
+    )
+    assert Job.objects.filter(status=Job.DONE).count() == 3
+
+
+def test_failed_job_is_retried_with_backoff():
+    job = queue.enqueue(
+        "tests.record", {"value": 1, "fail": True}, max_attempts=2
+    )
+    queue.run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.QUEUED and job.attempts == 1, (
+        "Убедитесь, что упавшая задача возвращается в очередь."
+    )
+    assert job.run_at > timezone.now()
+    assert "сбой обработчика" in job.last_error
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    queue.run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED and job.attempts == 2, (
+        "Убедитесь, что после последней попытки задача помечается ошибочной."
+    )
+
+
+def test_job_is_claimed_once():
+    job = queue.enqueue("tests.record", {"value": 1})
+    assert queue.claim(job.pk)
+    assert not queue.claim(job.pk), (
+        "Убедитесь, что одну задачу не забирают два исполнителя."
+    )
+    assert queue.run_pending() == 0
+
+    Job.objects.filter(pk=job.pk).update(
+        started_at=timezone.now() - timedelta(days=1)
+    )
+    assert queue.requeue_stale() == 1
+    assert queue.run_pending() == 1
+    assert calls == [1]
+
+
+@override_settings(
+    EMAIL_BACKEND="jobs.mail.QueuedEmailBackend",
+    JOBS_EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+def test_queued_email_backend():
+    message = EmailMultiAlternatives(
+        "Тема", "Текст", "blog@example.com", ["user@example.com"]
+    )
+    message.attach_alternative("<p>Текст</p>", "text/html")
+    message.attach("note.txt", "вложение", "text/plain")
+    assert message.send() == 1
+    assert not mail.outbox, (
+        "Убедитесь, что письма не отправляются во время запроса."
+    )
+    queue.run_pending()
+    assert len(mail.outbox) == 1, (
+        "Убедитесь, что исполнитель задач отправляет письма из очереди."
+    )
+    sent = mail.outbox[0]
+    assert (sent.subject, sent.body, sent.to) == (
+        "Тема", "Текст", ["user@example.com"]
+    )
+    assert sent.alternatives == [("<p>Текст</p>", "text/html")]
+    assert sent.attachments == [("note.txt", "вложение", "text/plain")]
@@ -0,0 +1,180 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+import pytz
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts_with_equal_pub_dates(mixer, user, published_category):
+    base = datetime.now(tz=pytz.UTC) - timedelta(days=1)
+    pub_dates = (
+        base - timedelta(hours=i // 3) for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
+def _walk(client, url, cursor_attr, start_cursor=None):
+    seen = []
+    cursor = start_cursor
+    while True:
+        response = client.get(url, {"cursor": cursor} if cursor else {})
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        seen.extend(post.id for post in page)
+        cursor = getattr(page, cursor_attr)
+        if cursor is None:
+            return seen, page
+
+
+@pytest.mark.parametrize("url_name", ["index", "category", "profile"])
+def test_cursor_pagination_walks_whole_feed(
+        client, user, published_category, posts_with_equal_pub_dates,
+        url_name
+):
+    url = {
+        "index": "/",
+        "category": f"/category/{published_category.slug}/",
+        "profile": f"/profile/{user.username}/",
+    }[url_name]
+    expected = [
+        post.id for post in sorted(
+            posts_with_equal_pub_dates,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+
+    forward, last_page = _walk(client, url, "next_cursor")
+    assert forward == expected, (
+        "Убедитесь, что курсорная пагинация проходит ленту без пропусков и"
+        " повторов в порядке «от новых к старым»."
+    )
+
+    backward, first_page = _walk(
+        client, url, "previous_cursor", last_page.previous_cursor
+    )
+    assert not first_page.has_previous()
+    assert sorted(backward) == sorted(expected[:-len(last_page)]), (
+        "Убедитесь, что по ссылкам «назад» можно вернуться к началу ленты."
+    )
+
+
+def test_invalid_cursor_returns_404(client):
+    response = client.get("/", {"cursor": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def _count_queries(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == HTTPStatus.OK
+    return response, [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT COUNT(*)")
+    ]
+
+
+@override_settings(FEED_PAGINATION="offset")
+def test_offset_pagination_caches_count(
+        user_client, mixer, user, published_category,
+        posts_with_equal_pub_dates
+):
+    _, count_queries = _count_queries(user_client, "/")
+    assert count_queries
+    response, count_queries = _count_queries(user_client, "/", {"page": 2})
+    assert not count_queries, (
+        "Убедитесь, что число записей ленты берётся из кэша."
+    )
+    assert response.context["paginator"].count == len(
+        posts_with_equal_pub_dates
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(minutes=1),
+    )
+    response, count_queries = _count_queries(user_client, "/")
+    assert count_queries, (
+        "Убедитесь, что кэш числа записей сбрасывается при добавлении"
+        " публикации."
+    )
+    assert response.context["paginator"].count == len(
+        posts_with_equal_pub_dates
+    ) + 1
+
+
+@override_settings(FEED_PAGINATION="offset", FEED_COUNT_LIMIT=N_PER_PAGE)
+def test_offset_pagination_has_more_mode(
+        user_client, posts_with_equal_pub_dates
+):
+    seen = []
+    page_number = 1
+    while True:
+        response = user_client.get("/", {"page": page_number})
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["page_obj"]
+        assert page.paginator.is_estimated
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            break
+        page_number += 1
+    assert len(seen) == len(set(seen)) == len(posts_with_equal_pub_dates), (
+        "Убедитесь, что в режиме «есть ещё» доступны все страницы ленты."
+    )
+
+
+@override_settings(COUNT_COMMENTS=5)
+def test_comments_are_loaded_in_batches(
+        client, mixer, user, post_with_published_location
+):
+    comments = mixer.cycle(13).blend(
+        "blog.Comment", post=post_with_published_location, author=user
+    )
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    page = response.context["comments"]
+    assert len(page) == 5, (
+        "Убедитесь, что на странице публикации выводится ограниченное число"
+        " комментариев."
+    )
+    seen = [comment.id for comment in page]
+    while page.has_next():
+        response = client.get(
+            f"{url}comments/", {"comments_cursor": page.next_cursor}
+        )
+        assert response.status_code == HTTPStatus.OK
+        page = response.context["comments"]
+        seen.extend(comment.id for comment in page)
+    assert seen == [
+        comment.id for comment in sorted(
+            comments, key=lambda comment: (comment.created_at, comment.id)
+        )
+    ], (
+        "Убедитесь, что по ссылке «Показать ещё» комментарии подгружаются"
+        " по порядку без пропусков и повторов."
+    )
+    assert "Показать ещё" not in response.content.decode("utf-8")
+
+
+def test_comments_fragment_respects_post_visibility(
+        client, unpublished_posts_with_published_locations
+):
+    post = unpublished_posts_with_published_locations[0]
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
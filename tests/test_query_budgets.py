@@ -0,0 +1,27 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def budget_urls(user, published_category, comment_to_a_post):
+    return (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+        f"/posts/{comment_to_a_post.post_id}/",
+        f"/posts/{comment_to_a_post.post_id}/comments/",
+        "/search/?q=a",
+    )
+
+
+@pytest.mark.parametrize(
+    "client_fixture", ["unlogged_client", "user_client", "another_user_client"]
+)
+def test_views_fit_query_budget(
+        request, client_fixture, assert_query_budget, budget_urls,
+        many_posts_with_published_locations
+):
+    client = request.getfixturevalue(client_fixture)
+    for url in budget_urls:
+        assert_query_budget(client, url)
@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="EXPLAIN QUERY PLAN есть только в SQLite",
+    ),
+]
+
+
+def _feed_queries(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url, params or {})
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` загружается без ошибок."
+    )
+    return response, [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("SELECT") and '"blog_' in query["sql"]
+    ]
+
+
+def _bad_plan_steps(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        details = [row[-1] for row in cursor.fetchall()]
+    # Упорядоченный обход индекса с LIMIT («SCAN ... USING INDEX») — это
+    # нормальный план для ленты, плохими считаются только полный обход
+    # таблицы и сортировка во временном B-дереве.
+    return [
+        detail for detail in details
+        if detail.startswith("USE TEMP B-TREE")
+        or (detail.startswith("SCAN ") and " USING " not in detail)
+    ]
+
+
+def _assert_indexed(client, url, params=None):
+    response, queries = _feed_queries(client, url, params)
+    assert queries, f"На странице `{url}` не выполнено ни одного запроса."
+    for sql in queries:
+        bad_steps = _bad_plan_steps(sql)
+        assert not bad_steps, (
+            f"Запрос страницы `{url}` выполняется без подходящего индекса "
+            f"({'; '.join(bad_steps)}):\n{sql}"
+        )
+    return response
+
+
+@pytest.fixture
+def feed_urls(user, published_category):
+    return (
+        "/",
+        f"/category/{published_category.slug}/",
+        f"/profile/{user.username}/",
+    )
+
+
+def test_feed_query_plans(
+        client, user_client, feed_urls, many_posts_with_published_locations
+):
+    for url in feed_urls:
+        response = _assert_indexed(client, url)
+        next_cursor = response.context["page_obj"].next_cursor
+        assert next_cursor
+        _assert_indexed(client, url, {"cursor": next_cursor})
+    # Автор видит в профиле и неопубликованные записи.
+    _assert_indexed(user_client, feed_urls[-1])
+
+
+def test_post_detail_query_plans(client, comment_to_a_post):
+    _assert_indexed(client, f"/posts/{comment_to_a_post.post_id}/")
+
+
+def test_admin_date_hierarchy_query_plans(
+        admin_client, mixer, user, published_category, published_location
+):
+    from django.utils import timezone
+
+    years = (2019, 2021, 2022)
+    mixer.cycle(len(years)).blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location,
+        pub_date=mixer.sequence(*(
+            timezone.make_aware(timezone.datetime(year, 3, 5))
+            for year in years
+        )),
+    )
+    levels = (
+        # Годы перечисляются от первой публикации до последней.
+        ({}, [f"pub_date__year={year}" for year in range(2019, 2023)]),
+        ({"pub_date__year": 2021}, ["pub_date__month=3"]),
+        ({"pub_date__year": 2021, "pub_date__month": 3}, ["pub_date__day=5"]),
+    )
+    for params, links in levels:
+        response, queries = _feed_queries(
+            admin_client, "/admin/blog/post/", params
+        )
+        # Строки списка и их подсчёт выбирают превью текста, остальные
+        # запросы к публикациям строят дерево дат.
+        date_queries = [
+            sql for sql in queries
+            if '"blog_post"' in sql and '"text_preview"' not in sql
+        ]
+        assert date_queries
+        for sql in date_queries:
+            bad_steps = _bad_plan_steps(sql)
+            assert not bad_steps, (
+                "Дерево дат в списке публикаций строится без индекса"
+                f" ({'; '.join(bad_steps)}):\n{sql}"
+            )
+        hierarchy = response.content.decode("utf-8").split(
+            'class="xfull"', 1
+        )[-1].split("</nav>", 1)[0]
+        for link in links:
+            assert link in hierarchy, (
+                "Убедитесь, что дерево дат в списке публикаций ведёт на"
+                " все периоды от первой публикации до последней."
+            )
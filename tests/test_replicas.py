@@ -0,0 +1,93 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+]
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+def _replica_queries(client, method, url, **data):
+    with CaptureQueriesContext(connections["replica"]) as ctx:
+        response = getattr(client, method)(url, data)
+    return response, ctx.captured_queries
+
+
+@pytest.mark.parametrize("url", ["/", "/pages/about/"])
+def test_read_views_use_replica(
+        replicas, user_client, url, post_with_published_location
+):
+    response, queries = _replica_queries(user_client, "get", url)
+    assert response.status_code == HTTPStatus.OK
+    assert queries, (
+        f"Убедитесь, что страница `{url}` читает данные с реплики."
+    )
+
+
+def test_primary_after_own_write(
+        replicas, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response, queries = _replica_queries(
+        user_client, "post", f"{url}comment/", text="Новый комментарий"
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert not queries, (
+        "Убедитесь, что добавление комментария не обращается к реплике."
+    )
+    assert "use_primary" in response.cookies, (
+        "Убедитесь, что после записи пользователь получает cookie,"
+        " закрепляющую его чтения за основной базой."
+    )
+
+    response, queries = _replica_queries(user_client, "get", url)
+    assert response.status_code == HTTPStatus.OK
+    assert not queries, (
+        "Убедитесь, что сразу после своей записи автор читает страницу"
+        " публикации с основной базы."
+    )
+
+
+def test_sync_replica(monkeypatch, tmp_path, post_with_published_location):
+    path = tmp_path / "replica.sqlite3"
+    monkeypatch.setitem(
+        connections["replica"].settings_dict, "NAME", str(path)
+    )
+    call_command("sync_replica", aliases=["replica"])
+    with sqlite3.connect(path) as replica:
+        titles = replica.execute("SELECT title FROM blog_post").fetchall()
+    assert titles == [(post_with_published_location.title,)], (
+        "Убедитесь, что sync_replica копирует базу в файл реплики."
+    )
+
+
+def test_replica_reads_not_cached(
+        replicas, client, post_with_published_location
+):
+    from django.core.cache import cache
+
+    for url in ("/", "/rss/"):
+        cache.clear()
+        response, queries = _replica_queries(client, "get", url)
+        assert response.status_code == HTTPStatus.OK and queries
+        assert "ETag" not in response and "use_primary" not in (
+            response.cookies
+        ), (
+            f"Убедитесь, что ответ `{url}`, прочитанный с реплики, не"
+            " получает валидаторов и не закрепляет посетителя за основной"
+            " базой."
+        )
+        _, queries = _replica_queries(client, "get", url)
+        assert queries, (
+            f"Убедитесь, что ответ `{url}`, собранный по чтениям с реплики,"
+            " не сохраняется в кэш."
+        )
@@ -0,0 +1,101 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.core.cache import cache
+from django.core.management import call_command
+
+from blog import scheduler
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_scheduled_post_becomes_visible(client, future_posts):
+    post = min(future_posts, key=lambda post: post.pub_date)
+    assert not Post.published_posts.filter(pk=post.pk).exists(), (
+        "Убедитесь, что отложенная публикация не видна до наступления"
+        " времени публикации."
+    )
+
+    scheduler.run_pending(now=post.pub_date + timedelta(seconds=1))
+
+    assert Post.published_posts.filter(pk=post.pk).exists(), (
+        "Убедитесь, что планировщик включает отложенную публикацию, когда"
+        " наступает время её публикации."
+    )
+    later_posts = [other for other in future_posts if other != post]
+    assert not Post.published_posts.filter(
+        pk__in=[other.pk for other in later_posts]
+    ).exists()
+
+
+def test_visibility_follows_category(
+        post_with_published_location, published_category
+):
+    post = post_with_published_location
+    published_category.is_published = False
+    published_category.save()
+    post.refresh_from_db()
+    assert not post.is_visible, (
+        "Убедитесь, что публикации скрываются при снятии категории с"
+        " публикации."
+    )
+
+    published_category.is_published = True
+    published_category.save()
+    post.refresh_from_db()
+    assert post.is_visible
+
+
+def test_visibility_follows_post_edits(post_with_published_location):
+    post = post_with_published_location
+    post.pub_date = datetime.now(tz=pytz.UTC) + timedelta(days=1)
+    post.save()
+    assert not Post.published_posts.filter(pk=post.pk).exists()
+
+    post.pub_date = datetime.now(tz=pytz.UTC) - timedelta(days=1)
+    post.save()
+    assert Post.published_posts.filter(pk=post.pk).exists()
+
+
+def test_scheduler_rechecks_posts_from_other_processes(
+        monkeypatch, settings, user, published_category
+):
+    scheduler.publish_due_posts()
+    # bulk_create минует сигналы, как запись из другого процесса.
+    Post.objects.bulk_create([Post(
+        title="Из другого процесса", text="Текст", author=user,
+        category=published_category,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(minutes=1),
+    )])
+    post = Post.objects.get(title="Из другого процесса")
+    assert scheduler.run_pending() == []
+
+    later = time.time() + settings.SCHEDULER_RECHECK_INTERVAL + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert scheduler.run_pending() == [post.pk], (
+        "Убедитесь, что процесс перепроверяет отложенные публикации в базе"
+        " не реже SCHEDULER_RECHECK_INTERVAL секунд."
+    )
+
+
+def test_due_posts_published_by_job_worker(client, user, published_category):
+    scheduler.publish_due_posts()
+    Post.objects.bulk_create([Post(
+        title="Пора публиковать", text="Текст", author=user,
+        category=published_category,
+        pub_date=datetime.now(tz=pytz.UTC) - timedelta(minutes=1),
+    )])
+    post = Post.objects.get(title="Пора публиковать")
+    # Запрос посетителя не платит за проверку расписания.
+    cache.delete(scheduler.NEXT_RUN_CACHE_KEY)
+    client.get("/")
+    assert not Post.published_posts.filter(pk=post.pk).exists()
+
+    call_command("run_jobs", "--once", "--workers=1")
+    assert Post.published_posts.filter(pk=post.pk).exists(), (
+        "Убедитесь, что отложенные публикации включает исполнитель"
+        " фоновых задач run_jobs."
+    )
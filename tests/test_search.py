@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+import pytz
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _search(client, query, cursor=None):
+    params = {"q": query}
+    if cursor:
+        params["cursor"] = cursor
+    response = client.get("/search/", params)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что страница поиска `/search/` загружается без ошибок."
+    )
+    return response.context["page_obj"]
+
+
+def _search_ids(client, query):
+    ids, cursor = [], None
+    while True:
+        page = _search(client, query, cursor)
+        ids.extend(post.id for post in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            return ids
+
+
+def test_search_ranks_and_paginates(client, mixer, user, published_category):
+    in_text = mixer.cycle(N_PER_PAGE + 2).blend(
+        "blog.Post", author=user, category=published_category,
+        title="Прогулка", text="Видели сову в лесу",
+    )
+    in_title = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Полярная сова", text="Белая птица",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        title="Ворона", text="Чёрная птица",
+    )
+    ids = _search_ids(client, "сов")
+    assert ids[0] == in_title.id, (
+        "Убедитесь, что совпадения в заголовке ранжируются выше совпадений"
+        " в тексте."
+    )
+    assert sorted(ids) == sorted(
+        [in_title.id] + [post.id for post in in_text]
+    ), (
+        "Убедитесь, что поиск по префиксу слова находит все подходящие"
+        " публикации без повторов на разных страницах."
+    )
+
+
+def test_search_respects_visibility(
+        client, mixer, user, published_category
+):
+    hidden = [
+        {"is_published": False, "category": published_category},
+        {
+            "pub_date": datetime.now(tz=pytz.UTC) + timedelta(days=1),
+            "category": published_category,
+        },
+        {"category__is_published": False},
+    ]
+    for kwargs in hidden:
+        mixer.blend("blog.Post", author=user, title="Секрет", **kwargs)
+    assert not _search_ids(client, "секрет"), (
+        "Убедитесь, что поиск находит только опубликованные публикации."
+    )
+
+
+def test_search_index_follows_updates(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    post.title = "Неожиданный заголовок"
+    post.save()
+    assert _search_ids(client, "неожиданный") == [post.id], (
+        "Убедитесь, что индекс поиска обновляется при изменении публикации."
+    )
+    post.delete()
+    assert not _search_ids(client, "неожиданный")
+
+
+@pytest.mark.parametrize("query", ["", '"', "OR AND", "*", "title:x", "сов("])
+def test_search_accepts_any_input(client, query):
+    _search(client, query)
@@ -0,0 +1,109 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from blogicum import sqlite, writequeue
+from blogicum.sqlite import get_pragmas, stats
+from blogicum.sqlite.base import DatabaseWrapper
+
+
+@pytest.mark.django_db
+def test_connection_pragmas(settings):
+    with connection.cursor() as cursor:
+        for name in ("busy_timeout", "cache_size"):
+            cursor.execute(f"PRAGMA {name}")
+            assert cursor.fetchone()[0] == settings.SQLITE_PRAGMAS[name], (
+                f"Убедитесь, что соединение с SQLite выполняет `PRAGMA {name}`"
+                " из `settings.SQLITE_PRAGMAS`."
+            )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_only_write_paths_begin_immediate(settings):
+    settings.WRITE_QUEUE_ENABLED = False
+    with CaptureQueriesContext(connection) as ctx:
+        with transaction.atomic():
+            pass
+        with sqlite.immediate():
+            with sqlite.immediate():
+                pass
+        writequeue.run(lambda: None)
+        with transaction.atomic():
+            pass
+    begins = [
+        query["sql"] for query in ctx.captured_queries
+        if query["sql"].startswith("BEGIN")
+    ]
+    assert begins == [
+        "BEGIN", "BEGIN IMMEDIATE", "BEGIN IMMEDIATE", "BEGIN"
+    ], (
+        "Убедитесь, что блокировку записи сразу берут только транзакции"
+        " записи (`blogicum.sqlite.immediate()`, `writequeue.run()`), а не"
+        " каждая `transaction.atomic()`."
+    )
+
+
+@pytest.mark.parametrize("pragmas", [
+    {"writable_schema": "on"},
+    {"journal_mode": "wal; DROP TABLE blog_post"},
+])
+def test_invalid_pragmas_rejected(pragmas):
+    with pytest.raises(ImproperlyConfigured):
+        get_pragmas({"PRAGMAS": pragmas})
+
+
+@pytest.fixture
+def file_connection(tmp_path, django_db_blocker):
+    wrapper = DatabaseWrapper(
+        {
+            **connection.settings_dict,
+            "NAME": str(tmp_path / "health.sqlite3"),
+            "CONN_MAX_AGE": 60,
+            "CONN_HEALTH_CHECKS": True,
+        },
+        alias="health",
+    )
+    stats.reset()
+    with django_db_blocker.unblock():
+        yield wrapper
+        wrapper.close()
+
+
+def _request_cycle(wrapper):
+    wrapper.close_if_unusable_or_obsolete()
+    with wrapper.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.execute("SELECT 2")
+
+
+def test_persistent_connection_reused(file_connection):
+    for _ in range(3):
+        _request_cycle(file_connection)
+    counters = stats.snapshot()["health"]
+    assert (counters["opened"], counters["reused"], counters["checks"]) == (
+        1, 2, 2
+    ), (
+        "Убедитесь, что постоянное соединение переиспользуется запросами и"
+        " проверяется один раз перед первым обращением в запросе."
+    )
+
+
+def test_broken_connection_reopened(file_connection):
+    _request_cycle(file_connection)
+    file_connection.connection.close()
+    _request_cycle(file_connection)
+    counters = stats.snapshot()["health"]
+    assert (counters["opened"], counters["failed_checks"]) == (2, 1), (
+        "Убедитесь, что соединение, не прошедшее проверку, открывается"
+        " заново."
+    )
+
+
+@pytest.mark.django_db
+def test_metrics_report_connections(admin_client):
+    response = admin_client.get("/metrics/")
+    assert "default" in response.json()["connections"], (
+        "Убедитесь, что `/metrics/` показывает статистику соединений"
+        " воркера."
+    )
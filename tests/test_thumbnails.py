@@ -0,0 +1,76 @@
+from io import BytesIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.thumbnails import variant_name
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    buffer = BytesIO()
+    Image.new("RGBA", (1600, 1200), (200, 10, 10, 128)).save(buffer, "PNG")
+    image = SimpleUploadedFile(
+        "large.png", buffer.getvalue(), content_type="image/png"
+    )
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category, image=image
+    )
+    assert post.image_card_url == post.image.url, (
+        "Убедитесь, что варианты изображения создаются фоновой задачей, а"
+        " не во время запроса."
+    )
+    call_command("run_jobs", "--once", "--workers=1")
+    return post
+
+
+def test_variants_are_generated_on_save(post_with_large_image):
+    storage = post_with_large_image.image.storage
+    for variant, size in settings.POST_IMAGE_VARIANTS.items():
+        name = variant_name(post_with_large_image.image.name, variant)
+        assert storage.exists(name), (
+            f"Убедитесь, что при сохранении публикации создаётся вариант"
+            f" изображения `{variant}`."
+        )
+        with storage.open(name) as file:
+            width, height = Image.open(file).size
+        assert width <= size[0] and height <= size[1]
+
+
+def test_feeds_and_detail_use_variants(client, post_with_large_image):
+    pages = {
+        "/": "card",
+        f"/posts/{post_with_large_image.id}/": "detail",
+    }
+    for url, variant in pages.items():
+        images = [
+            image["src"] for image in BeautifulSoup(
+                client.get(url).content.decode("utf-8"),
+                features="html.parser"
+            ).find_all("img")
+            if not image["src"].startswith(settings.STATIC_URL)
+        ]
+        assert images == [
+            getattr(post_with_large_image, f"image_{variant}_url")
+        ], (
+            f"Убедитесь, что страница `{url}` показывает одно изображение"
+            f" публикации в варианте `{variant}`."
+        )
+        assert images[0] != post_with_large_image.image.url
+
+
+def test_make_thumbnails_restores_missing_variants(post_with_large_image):
+    storage = post_with_large_image.image.storage
+    name = variant_name(post_with_large_image.image.name, "card")
+    storage.delete(name)
+    assert post_with_large_image.image_card_url == (
+        post_with_large_image.image.url
+    )
+    call_command("make_thumbnails")
+    assert storage.exists(name)
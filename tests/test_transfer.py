@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _snapshot():
+    return {
+        "category": list(Category.objects.order_by("pk").values()),
+        "location": list(Location.objects.order_by("pk").values()),
+        "post": list(Post.objects.order_by("pk").values()),
+        "comment": list(Comment.objects.order_by("pk").values()),
+    }
+
+
+def _drop_updated_at(snapshot):
+    for post in snapshot["post"]:
+        post.pop("updated_at")
+    return snapshot
+
+
+def _clear():
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+
+
+def test_jsonl_round_trip(
+        tmp_path, mixer, user, many_posts_with_published_locations,
+        unpublished_posts_with_published_locations
+):
+    mixer.cycle(5).blend(
+        "blog.Comment", author=user,
+        post=mixer.sequence(*many_posts_with_published_locations),
+    )
+    expected = _drop_updated_at(_snapshot())
+    path = tmp_path / "blog.jsonl"
+    call_command("export_blog", output=str(path), chunk_size=7)
+    assert {
+        json.loads(line)["model"] for line in path.open(encoding="utf-8")
+    } == set(expected)
+
+    _clear()
+    call_command("import_blog", str(path), batch_size=4)
+    assert _drop_updated_at(_snapshot()) == expected, (
+        "Убедитесь, что выгрузка и загрузка сохраняют все записи, их"
+        " первичные ключи, даты, видимость и счётчики комментариев."
+    )
+    assert not (tmp_path / "blog.jsonl.checkpoint").exists()
+
+
+def test_import_resumes_from_checkpoint(
+        tmp_path, many_posts_with_published_locations
+):
+    path = tmp_path / "posts.csv"
+    call_command(
+        "export_blog", output=str(path), format="csv", models=["post"]
+    )
+    expected = _drop_updated_at(_snapshot())["post"]
+    Post.objects.all().delete()
+    (tmp_path / "posts.csv.checkpoint").write_text(
+        json.dumps({"path": str(path), "position": 3}), encoding="utf-8"
+    )
+    call_command("import_blog", str(path), model="post", batch_size=2)
+    imported = _drop_updated_at(_snapshot())["post"]
+    assert imported == expected[3:], (
+        "Убедитесь, что загрузка продолжается с контрольной точки."
+    )
+
+    call_command(
+        "import_blog", str(path), model="post", batch_size=2, restart=True
+    )
+    assert _drop_updated_at(_snapshot())["post"] == expected, (
+        "Убедитесь, что повторная загрузка пропускает уже загруженные"
+        " записи и не создаёт дублей."
+    )
+
+
+def test_import_skips_comments_on_skipped_posts(
+        tmp_path, mixer, user, another_user, post_with_published_location,
+        post_of_another_author
+):
+    kept = mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location
+    )
+    mixer.blend("blog.Comment", author=user, post=post_of_another_author)
+    path = tmp_path / "blog.jsonl"
+    call_command("export_blog", output=str(path))
+    _clear()
+    another_user.delete()
+
+    call_command("import_blog", str(path))
+    assert list(Post.objects.values_list("pk", flat=True)) == [
+        post_with_published_location.pk
+    ]
+    assert list(Comment.objects.values_list("pk", flat=True)) == [kept.pk], (
+        "Убедитесь, что комментарии к пропущенным публикациям тоже"
+        " пропускаются, а не обрывают загрузку."
+    )
@@ -0,0 +1,206 @@
+import threading
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.models import Comment, Location, Post
+from blogicum import writequeue
+from blogicum.writequeue import write_queue
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def queue_enabled(settings, tmp_path):
+    settings.WRITE_QUEUE_ENABLED = True
+    settings.WRITE_QUEUE_LOCK_FILE = tmp_path / "write.lock"
+    write_queue.reset_metrics()
+
+
+def _create_location(name, fail=False):
+    Location.objects.create(name=name)
+    if fail:
+        raise ValueError(name)
+    return name
+
+
+def test_comment_written_by_queue(
+        queue_enabled, user_client, post_with_published_location
+):
+    response = user_client.post(
+        f"/posts/{post_with_published_location.id}/comment/",
+        {"text": "Через очередь"},
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert Comment.objects.filter(text="Через очередь").exists()
+    assert write_queue.metrics()["jobs"] == 1, (
+        "Убедитесь, что при включённой очереди комментарий записывает"
+        " поток-писатель."
+    )
+
+
+def test_post_upload_saved_outside_queue(
+        queue_enabled, monkeypatch, settings, tmp_path, user_client,
+        published_category
+):
+    settings.MEDIA_ROOT = tmp_path
+    save = FileSystemStorage._save
+    writer_saves = []
+
+    def record_save(storage, name, content):
+        writer_saves.append(write_queue.is_writer_thread())
+        return save(storage, name, content)
+
+    monkeypatch.setattr(FileSystemStorage, "_save", record_save)
+    buffer = BytesIO()
+    Image.new("RGB", (10, 10)).save(buffer, "PNG")
+    response = user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01 10:00",
+        "category": published_category.id,
+        "is_published": True,
+        "image": SimpleUploadedFile(
+            "small.png", buffer.getvalue(), content_type="image/png"
+        ),
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    post = Post.objects.get(title="С картинкой")
+    assert post.image and post.image.storage.exists(post.image.name)
+    assert write_queue.metrics()["jobs"] == 1
+    assert writer_saves and not any(writer_saves), (
+        "Убедитесь, что загруженный файл сохраняется в потоке запроса, а"
+        " поток-писатель выполняет только запись в базу."
+    )
+
+
+def test_changelist_queues_only_writes(
+        queue_enabled, monkeypatch, admin_client
+):
+    from django.contrib.admin import ModelAdmin
+    from django.contrib.admin.models import LogEntry
+
+    from blog.admin import LocationAdmin
+
+    location = Location.objects.create(name="Место", is_published=False)
+    formset_threads = []
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset_threads.append(write_queue.is_writer_thread())
+        return ModelAdmin.get_changelist_formset(self, request, **kwargs)
+
+    monkeypatch.setattr(
+        LocationAdmin, "get_changelist_formset", get_changelist_formset
+    )
+    response = admin_client.post("/admin/blog/location/", {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 1,
+        "form-0-id": location.id,
+        "form-0-is_published": "on",
+        "_save": "Сохранить",
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    location.refresh_from_db()
+    assert location.is_published
+    assert LogEntry.objects.filter(object_id=str(location.id)).exists()
+    assert write_queue.metrics()["jobs"] == 1, (
+        "Убедитесь, что записи списка админки передаются очереди одной"
+        " функцией."
+    )
+    assert formset_threads and not any(formset_threads), (
+        "Убедитесь, что формсет списка админки строится и проверяется в"
+        " потоке запроса, а не потоком-писателем."
+    )
+
+    response = admin_client.post("/admin/blog/location/", {
+        "action": "delete_selected",
+        "_selected_action": [location.id],
+        "post": "yes",
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    assert not Location.objects.filter(pk=location.id).exists()
+    assert write_queue.metrics()["jobs"] == 2
+
+
+def test_pending_writes_share_one_commit(queue_enabled):
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    first = write_queue.submit(block)
+    started.wait(5)
+    futures = [
+        write_queue.submit(_create_location, f"Место {number}",
+                           fail=number == 2)
+        for number in range(5)
+    ]
+    release.set()
+    first.result(5)
+    with pytest.raises(ValueError):
+        futures[2].result(5)
+    assert [
+        future.result(5) for number, future in enumerate(futures)
+        if number != 2
+    ] == ["Место 0", "Место 1", "Место 3", "Место 4"]
+
+    metrics = write_queue.metrics()
+    assert (metrics["groups"], metrics["jobs"], metrics["failed"]) == (
+        2, 6, 1
+    ), "Убедитесь, что ожидающие записи выполняются одной группой."
+    assert not Location.objects.filter(name="Место 2").exists(), (
+        "Убедитесь, что ошибка одной записи откатывает только её изменения."
+    )
+    assert Location.objects.filter(name__startswith="Место").count() == 4
+
+
+def test_caches_invalidated_after_group_commit(
+        queue_enabled, post_with_published_location
+):
+    from blog.caching import get_generation
+
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    def save_post():
+        post_with_published_location.title = "В группе"
+        post_with_published_location.save()
+        return get_generation("pages")
+
+    first = write_queue.submit(block)
+    started.wait(5)
+    saved = write_queue.submit(save_post)
+    later = write_queue.submit(get_generation, "pages")
+    release.set()
+    first.result(5)
+    generation = saved.result(5)
+    assert later.result(5) == generation, (
+        "Убедитесь, что до COMMIT группы кэш повторно не сбрасывается."
+    )
+    assert get_generation("pages") != generation, (
+        "Убедитесь, что после COMMIT группы записей кэш сбрасывается"
+        " повторно."
+    )
+
+
+def test_run_without_queue(settings):
+    settings.WRITE_QUEUE_ENABLED = False
+    assert writequeue.run(_create_location, "Сразу") == "Сразу"
+    assert not write_queue.is_writer_thread()
+
+
+def test_metrics_for_staff_only(client, admin_client):
+    assert client.get("/metrics/").status_code == HTTPStatus.FOUND
+    response = admin_client.get("/metrics/")
+    assert response.status_code == HTTPStatus.OK
+    assert {"depth", "max_depth", "commit"} <= set(
+        response.json()["write_queue"]
+    )